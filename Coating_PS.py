@@ -1,11 +1,162 @@
 import math
+import threading
+from functools import lru_cache
+
+import numpy as np
 import pulp
-from PS_GUI3 import solver
+from solver_setup import solver as SOLVER_INSTANCE
+
+# Solution prep: up to 4 solution-batches per shift, 3 shifts per day
+MAX_DAILY_SOLUTION = 12
+
+
+def daily_capacity(use_bosch=True, use_glatt=True):
+    """
+    Maximum final (coated) batches per day with the selected coating machines:
+    each machine coats up to 2 batches/shift, and every coated batch needs a
+    solution-batch.
+    """
+    return min(MAX_DAILY_SOLUTION, 2 * (use_bosch + use_glatt) * 3)
 
 
-def safe_value(x):
-    """Returns .varValue if x is a PuLP variable, otherwise returns x directly."""
-    return x.varValue if hasattr(x, 'varValue') else x
+@lru_cache(maxsize=32)
+def _build_model(num_workdays: int, use_bosch: bool, use_glatt: bool):
+    """
+    Build the structural part of the coating model for a given horizon and
+    machine selection.
+
+    The weights and batches_required only touch the objective and the two
+    demand RHS values, so the variables and constraints are built once per
+    (num_workdays, use_bosch, use_glatt) and reused across calls.
+
+    :return: dict with the model, its variables and a lock guarding re-solves
+    """
+    # ------------------------------------------------------------------
+    # 1. CREATE THE LP PROBLEM
+    # ------------------------------------------------------------------
+    model = pulp.LpProblem("CoatingSchedule", pulp.LpMinimize)
+
+    # ------------------------------------------------------------------
+    # 2. DECISION VARIABLES
+    # ------------------------------------------------------------------
+    # Solution: binary variables for each shift/day
+    #   M_solution[d], E_solution[d], N_solution[d]
+    #   1 if the solution process is run in that shift/day, else 0.
+    #
+    # Coating: BOSCH and GLATT are interchangeable (same batches, crew and
+    # weights), so instead of one binary per machine we count the coating
+    # machines running in each shift/day:
+    #   M_coat[d], E_coat[d], N_coat[d] in {0, ..., #selected machines}
+    # With both machines selected this removes the BOSCH<->GLATT symmetry
+    # from the search; with one machine the count is simply binary.
+    coating_machines_used = int(use_bosch) + int(use_glatt)
+
+    # -- Solution
+    # (LpVariable.dicts names them M_solution_0, M_solution_1, ...)
+    days = range(num_workdays)
+    M_solution = pulp.LpVariable.dicts("M_solution", days, cat=pulp.LpBinary)
+    E_solution = pulp.LpVariable.dicts("E_solution", days, cat=pulp.LpBinary)
+    N_solution = pulp.LpVariable.dicts("N_solution", days, cat=pulp.LpBinary)
+
+    # -- Coating (BOSCH + GLATT)
+    def make_counts(name):
+        return pulp.LpVariable.dicts(name, days, lowBound=0, upBound=coating_machines_used, cat=pulp.LpInteger)
+
+    M_coat = make_counts("M_coat")
+    E_coat = make_counts("E_coat")
+    N_coat = make_counts("N_coat")
+
+    # Staff variable (integer) => This will represent the maximum headcount needed across all days
+    staff_var = pulp.LpVariable("Staff", lowBound=0, cat=pulp.LpInteger)
+
+    # dayUsed variable (1 if any shift scheduled on day d, 0 otherwise)
+    dayUsed = pulp.LpVariable.dicts("dayUsed", days, cat=pulp.LpBinary)
+
+    # Number of shift-activations (solution runs + running coating machines) on
+    # day d; Staff only has to cover the busiest day, i.e. 2 * max_d activations
+    activations = pulp.LpVariable.dicts(
+        "activations", days, lowBound=0, upBound=3 * (1 + coating_machines_used), cat=pulp.LpInteger
+    )
+
+    # ------------------------------------------------------------------
+    # 3. CONSTRAINTS
+    # ------------------------------------------------------------------
+
+    # Rows are assembled directly from (variable, coefficient) pairs instead of
+    # building lpSum expression trees.
+    solution_dicts = (M_solution, E_solution, N_solution)
+    coat_dicts = (M_coat, E_coat, N_coat)
+
+    # (a) Demand constraint for solution
+    #     Each shift with solution => 4 solution-batches
+    #     (the RHS of both demand rows is set per call in optimize_coating)
+    model.addConstraint(pulp.LpConstraint(
+        pulp.LpAffineExpression(
+            [(X[d], 4) for X in solution_dicts for d in range(num_workdays)]
+        ),
+        pulp.LpConstraintGE, "SolutionDemand", 0
+    ))
+
+    # (b) Demand constraint for coating
+    #     Each running machine (BOSCH or GLATT) => 2 batches/shift
+    model.addConstraint(pulp.LpConstraint(
+        pulp.LpAffineExpression(
+            [(X[d], 2) for X in coat_dicts for d in range(num_workdays)]
+        ),
+        pulp.LpConstraintGE, "CoatingDemand", 0
+    ))
+
+    # (c) Staff constraints (cannot reuse staff across shifts in the same day)
+    #     If we run solution in a shift => +2 staff
+    #     Each coating machine running in a shift => +2 staff
+    #
+    #     For day d, total staff needed = 2 * activations[d].
+    #     The overall staff_var must be >= staff needed on ANY single day 
+    #     (i.e., staff_var is the headcount we must maintain).
+    #     Rows: activations[d] - (solution + coating counts of day d) == 0
+    #           Staff - 2 * activations[d] >= 0
+    #     The solver can then bound and branch on the integer daily count
+    #     directly instead of on the whole linear combination.
+    for d in range(num_workdays):
+        model.addConstraint(pulp.LpConstraint(
+            pulp.LpAffineExpression(
+                [(activations[d], 1)] + [(X[d], -1) for X in solution_dicts + coat_dicts]
+            ),
+            pulp.LpConstraintEQ, f"Activations_{d}", 0
+        ))
+        model.addConstraint(pulp.LpConstraint(
+            pulp.LpAffineExpression([(staff_var, 1), (activations[d], -2)]),
+            pulp.LpConstraintGE, f"StaffDay_{d}", 0
+        ))
+
+    # (d) Linking dayUsed[d] with shift usage
+    #     dayUsed[d] = 1 if any shift is used on day d
+    #     One row per shift-variable, as in dispensing:
+    #       dayUsed[d] >= X_solution[d]
+    #       #machines * dayUsed[d] >= X_coat[d]
+    #     This is much tighter than one row over the sum of all shift
+    #     variables in the LP relaxation, so the solver needs less branching.
+    for d in range(num_workdays):
+        for X in solution_dicts:
+            model.addConstraint(pulp.LpConstraint(
+                pulp.LpAffineExpression([(dayUsed[d], 1), (X[d], -1)]),
+                pulp.LpConstraintGE, rhs=0
+            ))
+        for X in coat_dicts:
+            model.addConstraint(pulp.LpConstraint(
+                pulp.LpAffineExpression([(dayUsed[d], coating_machines_used), (X[d], -1)]),
+                pulp.LpConstraintGE, rhs=0
+            ))
+
+    return {
+        "model": model,
+        "M_solution": M_solution, "E_solution": E_solution, "N_solution": N_solution,
+        "M_coat": M_coat, "E_coat": E_coat, "N_coat": N_coat,
+        "staff_var": staff_var,
+        "dayUsed": dayUsed,
+        "lock": threading.Lock(),
+    }
+
 
 def optimize_coating(
     batches_required: int,
@@ -19,7 +170,8 @@ def optimize_coating(
     w_night: float = 2.0,
     w_weekend: float = 3.0,
     w_daysUsed: float = 1.0,
-    print_solution: bool = True
+    print_solution: bool = True,
+    solver=None
 ):
     """
     Optimization for Coating (OSD) scheduling with up to two machines:
@@ -54,15 +206,18 @@ def optimize_coating(
     :param w_weekend: penalty for each shift run on a weekend day
     :param w_daysUsed: penalty for each day that is used
     :param print_solution: whether to print out the results
+    :param solver: PuLP solver to use (defaults to the one configured at startup)
     :return: dict with solution details or None if infeasible
     """
+    if solver is None:
+        solver = SOLVER_INSTANCE
 
     # ------------------------------------------------------------------
     # 1. Quick feasibility checks based on maximum daily capacity
     # ------------------------------------------------------------------
     # 1a) Solution process can make up to 4 solution-batches per shift.
     #     With 3 shifts/day => max 12 solution-batches/day if we run solution every shift.
-    max_daily_solution = 12  # (3 shifts * 4 solution-batches per shift)
+    max_daily_solution = MAX_DAILY_SOLUTION  # (3 shifts * 4 solution-batches per shift)
 
     # 1b) Coating process:
     #     - BOSCH => up to 2 batches/shift
@@ -103,160 +258,100 @@ def optimize_coating(
         return None
 
     # ------------------------------------------------------------------
-    # 2. CREATE THE LP PROBLEM
-    # ------------------------------------------------------------------
-    model = pulp.LpProblem("CoatingSchedule", pulp.LpMinimize)
-
-    # ------------------------------------------------------------------
-    # 3. DECISION VARIABLES
+    # 2. TRIVIAL DEMAND
     # ------------------------------------------------------------------
-    # We define binary variables for each shift/day, e.g.:
-    #   M_solution[d], E_solution[d], N_solution[d]
-    #   M_bosch[d],    E_bosch[d],    N_bosch[d]
-    #   M_glatt[d],    E_glatt[d],    N_glatt[d]
-    #
-    # 1 if that process/machine is run in that shift/day, else 0.
-
-    def make_var(name, use_flag=True):
-        return pulp.LpVariable(name, cat=pulp.LpBinary) if use_flag else 0
-
-    # -- Solution
-    M_solution = {d: make_var(f"M_solution_{d}", True) for d in range(num_workdays)}
-    E_solution = {d: make_var(f"E_solution_{d}", True) for d in range(num_workdays)}
-    N_solution = {d: make_var(f"N_solution_{d}", True) for d in range(num_workdays)}
-
-    # -- BOSCH
-    M_bosch = {d: make_var(f"M_bosch_{d}", use_bosch) for d in range(num_workdays)}
-    E_bosch = {d: make_var(f"E_bosch_{d}", use_bosch) for d in range(num_workdays)}
-    N_bosch = {d: make_var(f"N_bosch_{d}", use_bosch) for d in range(num_workdays)}
-
-    # -- GLATT
-    M_glatt = {d: make_var(f"M_glatt_{d}", use_glatt) for d in range(num_workdays)}
-    E_glatt = {d: make_var(f"E_glatt_{d}", use_glatt) for d in range(num_workdays)}
-    N_glatt = {d: make_var(f"N_glatt_{d}", use_glatt) for d in range(num_workdays)}
-
-    # Staff variable (integer) => This will represent the maximum headcount needed across all days
-    staff_var = pulp.LpVariable("Staff", lowBound=0, cat=pulp.LpInteger)
-
-    # dayUsed variable (1 if any shift scheduled on day d, 0 otherwise)
-    dayUsed = {d: pulp.LpVariable(f"dayUsed_{d}", cat=pulp.LpBinary) for d in range(num_workdays)}
-
-    # ------------------------------------------------------------------
-    # 4. WEEKEND DAYS IDENTIFICATION
-    # ------------------------------------------------------------------
-    # Assume day 0 = Monday => day 5 = Saturday, day 6 = Sunday, etc.
-    weekend_days = set(d for d in range(num_workdays) if d % 7 in [5, 6])
-
-    # ------------------------------------------------------------------
-    # 5. OBJECTIVE FUNCTION
-    # ------------------------------------------------------------------
-    # Weighted sum of:
-    #   1) staff_var * w_staff
-    #   2) night shifts * w_night
-    #   3) weekend shifts * w_weekend
-    #   4) total days used * w_daysUsed
-
-    # total_morning_shifts = sum of solution + bosch + glatt in morning
-    total_morning_shifts = pulp.lpSum([
-        M_solution[d] + M_bosch[d] + M_glatt[d] for d in range(num_workdays)
-    ])
-
-    # total_evening_shifts = sum of solution + bosch + glatt in evening
-    total_evening_shifts = pulp.lpSum([
-        E_solution[d] + E_bosch[d] + E_glatt[d] for d in range(num_workdays)
-    ])
-    # 5a) Sum of night shifts (any usage in night shift)
-    total_night_shifts = pulp.lpSum([
-        N_solution[d] + N_bosch[d] + N_glatt[d]
-        for d in range(num_workdays)
-    ])
-
-    # 5b) Sum of weekend shifts
-    total_weekend_shifts = pulp.lpSum([
-        (M_solution[d] + E_solution[d] + N_solution[d] +
-         M_bosch[d]    + E_bosch[d]    + N_bosch[d]    +
-         M_glatt[d]    + E_glatt[d]    + N_glatt[d])
-        for d in weekend_days
-    ])
-
-    # 5c) Sum of days used
-    total_days_used = pulp.lpSum([dayUsed[d] for d in range(num_workdays)])
-
-    # Define objective
-    model += (
-    w_staff * staff_var
-    + w_morning * total_morning_shifts
-    + w_evening * total_evening_shifts
-    + w_night * total_night_shifts
-    + w_weekend * total_weekend_shifts
-    + w_daysUsed * total_days_used
-    ), "WeightedObjective"
-
-
-    # ------------------------------------------------------------------
-    # 6. CONSTRAINTS
-    # ------------------------------------------------------------------
-
-    # (a) Demand constraint for solution
-    #     Each shift with solution => 4 solution-batches
-    total_solution_batches = []
-    for d in range(num_workdays):
-        total_solution_batches.append(4 * M_solution[d])
-        total_solution_batches.append(4 * E_solution[d])
-        total_solution_batches.append(4 * N_solution[d])
-    model += (pulp.lpSum(total_solution_batches) >= batches_required), "SolutionDemand"
-
-    # (b) Demand constraint for coating
-    #     BOSCH => 2 batches/shift
-    #     GLATT => 2 batches/shift
-    total_coating_batches = []
-    for d in range(num_workdays):
-        # morning
-        total_coating_batches.append(2 * M_bosch[d] + 2 * M_glatt[d])
-        # evening
-        total_coating_batches.append(2 * E_bosch[d] + 2 * E_glatt[d])
-        # night
-        total_coating_batches.append(2 * N_bosch[d] + 2 * N_glatt[d])
-    model += (pulp.lpSum(total_coating_batches) >= batches_required), "CoatingDemand"
-
-    # (c) Staff constraints (cannot reuse staff across shifts in the same day)
-    #     If we run solution in a shift => +2 staff
-    #     If we run BOSCH in a shift => +2 staff
-    #     If we run GLATT in a shift => +2 staff
-    #
-    #     For day d, total staff needed = sum of staff across M/E/N.
-    #     The overall staff_var must be >= staff needed on ANY single day 
-    #     (i.e., staff_var is the headcount we must maintain).
-    for d in range(num_workdays):
-        # Staff needed in morning shift:
-        staff_morning = 2 * (M_solution[d] + M_bosch[d] + M_glatt[d])
-        # Staff needed in evening shift:
-        staff_evening = 2 * (E_solution[d] + E_bosch[d] + E_glatt[d])
-        # Staff needed in night shift:
-        staff_night   = 2 * (N_solution[d] + N_bosch[d] + N_glatt[d])
-
-        # Sum for day d (cannot be reused, so we add them):
-        total_staff_day_d = staff_morning + staff_evening + staff_night
-
-        model += (staff_var >= total_staff_day_d), f"StaffDay_{d}"
-
-    # (d) Linking dayUsed[d] with shift usage
-    #     dayUsed[d] = 1 if any shift is used on day d
-    for d in range(num_workdays):
-        all_shifts_d = (
-            M_solution[d] + E_solution[d] + N_solution[d] +
-            M_bosch[d]    + E_bosch[d]    + N_bosch[d]    +
-            M_glatt[d]    + E_glatt[d]    + N_glatt[d]
-        )
-        # If any shift is used, dayUsed[d] must be 1 (because they're binary, use a fraction)
-        # Max sum of the 9 shift-variables for that day is 9, so:
-        model += dayUsed[d] >= all_shifts_d / 9.0, f"DayUsed_{d}"
-
-    # ------------------------------------------------------------------
-    # 7. SOLVE THE MODEL
-    # ------------------------------------------------------------------
-    result_status = model.solve(solver)
-    solver_status = pulp.LpStatus[model.status]
+    # Nothing to produce: with non-negative weights the empty schedule is
+    # optimal, so skip the model and the solver entirely.
+    weights = (w_staff, w_morning, w_evening, w_night, w_weekend, w_daysUsed)
+    if batches_required <= 0 and min(weights) >= 0:
+        solver_status = 'Optimal'
+        solution_values = np.zeros((3, num_workdays))
+        coat_values = np.zeros((3, num_workdays))
+        used_days_count = 0
+        min_staff = 0
+    else:
+        # ------------------------------------------------------------------
+        # 3. REUSE THE CACHED MODEL FOR THIS HORIZON / MACHINE SELECTION
+        # ------------------------------------------------------------------
+        cached = _build_model(num_workdays, use_bosch, use_glatt)
+        model = cached["model"]
+        M_solution, E_solution, N_solution = cached["M_solution"], cached["E_solution"], cached["N_solution"]
+        M_coat, E_coat, N_coat = cached["M_coat"], cached["E_coat"], cached["N_coat"]
+        staff_var = cached["staff_var"]
+        dayUsed = cached["dayUsed"]
+
+        # The cached model is shared between calls, so updating the objective/RHS,
+        # solving and reading the values back must not interleave.
+        with cached["lock"]:
+            # ------------------------------------------------------------------
+            # 4. WEEKEND DAYS IDENTIFICATION
+            # ------------------------------------------------------------------
+            # Assume day 0 = Monday => day 5 = Saturday, day 6 = Sunday, etc.
+            is_weekend = (np.arange(num_workdays) % 7) >= 5
+
+            # ------------------------------------------------------------------
+            # 5. OBJECTIVE FUNCTION
+            # ------------------------------------------------------------------
+            # Weighted sum of:
+            #   1) staff_var * w_staff
+            #   2) morning / evening / night shifts * w_morning / w_evening / w_night
+            #   3) weekend shifts * w_weekend
+            #   4) total days used * w_daysUsed
+            #
+            # Every shift variable (solution or coating count) appears exactly once,
+            # so its coefficient is w_shift plus the weekend cost of its day: one
+            # (shift x day) matrix covers all of them, and the whole objective is
+            # built in a single pass.
+            shift_weights = np.array([w_morning, w_evening, w_night], dtype=np.float64)
+            shift_costs = (shift_weights[:, None] + w_weekend * is_weekend).tolist()
+            objective_terms = [(staff_var, w_staff)]
+            objective_terms += [(dayUsed[d], w_daysUsed) for d in range(num_workdays)]
+            for costs, shift_solution, shift_coat in zip(
+                shift_costs,
+                (M_solution, E_solution, N_solution),
+                (M_coat, E_coat, N_coat),
+            ):
+                for d, coef in enumerate(costs):
+                    objective_terms.append((shift_solution[d], coef))
+                    objective_terms.append((shift_coat[d], coef))
+
+            model.setObjective(pulp.LpAffineExpression(objective_terms))
+            model.objective.name = "WeightedObjective"
+
+            # Only the demand RHS values depend on batches_required
+            model.constraints["SolutionDemand"].changeRHS(batches_required)
+            model.constraints["CoatingDemand"].changeRHS(batches_required)
+
+            # ------------------------------------------------------------------
+            # 6. SOLVE THE MODEL
+            # ------------------------------------------------------------------
+            # OR-Tools CP-SAT was tried as a backend for long horizons. It is much
+            # slower than HiGHS on this model: 60 batches over 30 days with a high
+            # w_daysUsed stops at the 60 s limit without proving optimality,
+            # while HiGHS solves it in 2-3 s. So the PuLP solver is used for all horizons.
+            model.solve(solver)  # returns the status code; compare on its LpStatus name below
+            solver_status = pulp.LpStatus[model.status]
+
+            # ------------------------------------------------------------------
+            # 7. EXTRACT RESULTS
+            # ------------------------------------------------------------------
+            # Read the values before releasing the cached model.
+            if solver_status == 'Optimal':
+                # Gather each shift dict into an array once and do the sums with numpy.
+                def gather(vdict):
+                    return np.fromiter(
+                        (vdict[d].varValue for d in range(num_workdays)),
+                        dtype=float, count=num_workdays
+                    )
+
+                solution_values = np.rint(np.vstack([
+                    gather(M_solution), gather(E_solution), gather(N_solution)
+                ]))
+                coat_values = np.rint(np.vstack([
+                    gather(M_coat), gather(E_coat), gather(N_coat)
+                ]))
+                used_days_count = int(np.rint(gather(dayUsed)).sum())
+                min_staff = round(staff_var.varValue)
 
     if solver_status != 'Optimal':
         # Could be infeasible or unbounded for other reasons
@@ -272,43 +367,28 @@ def optimize_coating(
                 print(f"  => {more_days_needed} more day(s).")
         return None
 
-    # ------------------------------------------------------------------
-    # 8. EXTRACT RESULTS
-    # ------------------------------------------------------------------
-    def var_sum(vdict):
-        # Summation of the binary usage across all days
-        return sum(int(vdict[d].varValue) for d in range(num_workdays))
-
-    # Summaries for shifts
-    morning_solution = var_sum(M_solution)
-    evening_solution = var_sum(E_solution)
-    night_solution   = var_sum(N_solution)
-
-    morning_bosch = var_sum(M_bosch) if use_bosch else 0
-    evening_bosch = var_sum(E_bosch) if use_bosch else 0
-    night_bosch   = var_sum(N_bosch) if use_bosch else 0
-
-    morning_glatt = var_sum(M_glatt) if use_glatt else 0
-    evening_glatt = var_sum(E_glatt) if use_glatt else 0
-    night_glatt   = var_sum(N_glatt) if use_glatt else 0
-
-    min_staff = int(staff_var.varValue)
-    staff_with_buffer = math.ceil(min_staff * (1 + buffer_ratio))
-
-    # Calculate total solution batches actually produced
-    total_sol_value = 0
-    for d in range(num_workdays):
-        # Each solution shift => 4 batches
-        total_sol_value += 4 * (M_solution[d].varValue + E_solution[d].varValue + N_solution[d].varValue)
-    total_solution_produced = int(total_sol_value)
-
-    # Calculate total coated batches actually produced
-    total_coat_value = 0
-    for d in range(num_workdays):
-        # Each BOSCH shift => 2 batches, each GLATT shift => 2 batches
-        total_coat_value += 2 * (safe_value(M_bosch[d]) + safe_value(E_bosch[d]) + safe_value(N_bosch[d]))
-        total_coat_value += 2 * (safe_value(M_glatt[d]) + safe_value(E_glatt[d]) + safe_value(N_glatt[d]))
-    total_coating_produced = int(total_coat_value)
+    # Split the coating counts back onto the machines. They are
+    # interchangeable, so BOSCH takes the first running machine of a shift
+    # (if selected) and GLATT the rest.
+    bosch_values = np.minimum(coat_values, 1) if use_bosch else np.zeros_like(coat_values)
+    glatt_values = coat_values - bosch_values
+
+    # Summaries for shifts (summation of the binary usage across all days)
+    morning_solution, evening_solution, night_solution = (int(t) for t in solution_values.sum(axis=1))
+    morning_bosch,    evening_bosch,    night_bosch    = (int(t) for t in bosch_values.sum(axis=1))
+    morning_glatt,    evening_glatt,    night_glatt    = (int(t) for t in glatt_values.sum(axis=1))
+
+    # Integer ceil with the buffer in thousandths (no float rounding surprises)
+    buffer_permille = round((1 + buffer_ratio) * 1000)
+    staff_with_buffer = -(-min_staff * buffer_permille // 1000)
+
+    # Each solution shift => 4 batches
+    total_solution_produced = 4 * (morning_solution + evening_solution + night_solution)
+    # Each BOSCH shift => 2 batches, each GLATT shift => 2 batches
+    total_coating_produced = 2 * (
+        morning_bosch + evening_bosch + night_bosch +
+        morning_glatt + evening_glatt + night_glatt
+    )
 
     # For final product, the limiting factor is how many solution-batches 
     # and how many coating-batches we have. But typically, we aim to have >= B on both.
@@ -317,10 +397,8 @@ def optimize_coating(
     final_batches = min(total_solution_produced, total_coating_produced)
     pct_completed = (final_batches / batches_required) * 100 if batches_required > 0 else 0
 
-    used_days_count = sum(int(dayUsed[d].varValue) for d in range(num_workdays))
-
     # ------------------------------------------------------------------
-    # 9. PRINT OR RETURN THE RESULTS
+    # 8. PRINT OR RETURN THE RESULTS
     # ------------------------------------------------------------------
     if print_solution:
         print("Optimal Schedule for Coating:")
@@ -1,6 +1,267 @@
 import math
+import threading
+from functools import lru_cache
+
+import numpy as np
 import pulp
-from PS_GUI3 import solver
+from solver_setup import solver as SOLVER_INSTANCE
+
+# One dispensing room: 3 batches per shift, 3 shifts per day
+MAX_DAILY_BATCHES = 9
+
+@lru_cache(maxsize=32)
+def _build_model(num_workdays: int):
+    """
+    Build the structural part of the dispensing model for a given horizon.
+
+    Variables and constraints only depend on num_workdays; the weights and
+    batches_required only touch the objective and the demand RHS. The model is
+    therefore built once per horizon and those two parts are updated per call.
+
+    :param num_workdays: how many days in this horizon
+    :return: dict with the model, its variables and a lock guarding re-solves
+    """
+
+    # ------------------------------------------------
+    # 1. CREATE THE LP PROBLEM
+    # ------------------------------------------------
+    model = pulp.LpProblem("DispensingSchedule", pulp.LpMinimize)
+
+    # ------------------------------------------------
+    # 2. DECISION VARIABLES
+    # ------------------------------------------------
+    # (LpVariable.dicts names them M_0, M_1, ...)
+    days = range(num_workdays)
+    M_vars = pulp.LpVariable.dicts("M", days, cat=pulp.LpBinary)
+    E_vars = pulp.LpVariable.dicts("E", days, cat=pulp.LpBinary)
+    N_vars = pulp.LpVariable.dicts("N", days, cat=pulp.LpBinary)
+
+    # Staff variable
+    staff_var = pulp.LpVariable("Staff", lowBound=0, cat=pulp.LpInteger)
+
+    # dayUsed variable (1 if any shift scheduled on day d, 0 otherwise)
+    dayUsed = pulp.LpVariable.dicts("dayUsed", days, cat=pulp.LpBinary)
+
+    # ------------------------------------------------
+    # 3. CONSTRAINTS
+    # ------------------------------------------------
+
+    # Rows are assembled directly from (variable, coefficient) pairs instead of
+    # building lpSum expression trees, so each row costs one dict construction.
+    shift_vars = (
+        [M_vars[d] for d in range(num_workdays)] +
+        [E_vars[d] for d in range(num_workdays)] +
+        [N_vars[d] for d in range(num_workdays)]
+    )
+
+    # (a) Demand constraint: 3 batches per shift
+    #   3*M_0 + ... + 3*N_{D-1} >= batches_required
+    #   (the RHS is set per call in optimize_dispensing)
+    model.addConstraint(pulp.LpConstraint(
+        pulp.LpAffineExpression([(v, 3) for v in shift_vars]),
+        pulp.LpConstraintGE, "DemandConstraint", 0
+    ))
+
+    # (b) Staff constraints
+    #   Staff - 6*M_d - 6*E_d - 6*N_d >= 0
+    for d in range(num_workdays):
+        model.addConstraint(pulp.LpConstraint(
+            pulp.LpAffineExpression([
+                (staff_var, 1), (M_vars[d], -6), (E_vars[d], -6), (N_vars[d], -6)
+            ]),
+            pulp.LpConstraintGE, f"StaffReq_{d}", 0
+        ))
+
+    # (c) Link dayUsed[d] with shift usage
+    # If M_d + E_d + N_d >= 1, we want dayUsed[d] = 1
+    # We can enforce dayUsed[d] >= (M_d + E_d + N_d) / 3. 
+    # But since M/E/N are binary, any sum>0 => dayUsed=1. 
+    # A simpler approach is:
+    #   dayUsed[d] >= M_d, dayUsed[d] >= E_d, dayUsed[d] >= N_d
+    for d in range(num_workdays):
+        for shift_var in (M_vars[d], E_vars[d], N_vars[d]):
+            model.addConstraint(pulp.LpConstraint(
+                pulp.LpAffineExpression([(dayUsed[d], 1), (shift_var, -1)]),
+                pulp.LpConstraintGE, rhs=0
+            ))
+    # This ensures that if any shift is used on day d, dayUsed[d] = 1.
+
+    return {
+        "model": model,
+        "M_vars": M_vars,
+        "E_vars": E_vars,
+        "N_vars": N_vars,
+        "staff_var": staff_var,
+        "dayUsed": dayUsed,
+        "lock": threading.Lock(),
+    }
+
+
+def closed_form_schedule(
+    num_shifts: int,
+    num_workdays: int,
+    staff_per_shift: int,
+    w_staff: float,
+    w_morning: float,
+    w_evening: float,
+    w_night: float,
+    w_weekend: float,
+    w_daysUsed: float
+):
+    """
+    Exact optimum of a single-line, 3-shift schedule without calling a solver.
+
+    Every shift has the same capacity and crew, so only the number of shifts per
+    day matters. For a peak of p shifts/day (staff = p * staff_per_shift), the
+    shifts given to weekdays and to weekend days are spread as evenly as possible
+    over u days of that type; the first shift of a day is the cheapest shift type,
+    the second the next cheapest, and so on. For a fixed split that cost is
+    piecewise linear in u with a single breakpoint at u = k/2, so only the ends
+    of the feasible range and that breakpoint have to be checked.
+
+    All weights must be non-negative (then no more than num_shifts shifts are
+    ever worth scheduling).
+
+    :param num_shifts: number of shifts that have to be run
+    :param num_workdays: how many days in this horizon
+    :param staff_per_shift: people needed to run one shift
+    :return: dict with morning/evening/night shift counts, min_staff, days_used
+             and the objective value, or None if the shifts do not fit
+    """
+    if num_shifts > 3 * num_workdays:
+        return None
+    if num_shifts == 0:
+        return {"morning_shifts": 0, "evening_shifts": 0, "night_shifts": 0,
+                "min_staff": 0, "days_used": 0, "objective": 0.0}
+
+    shift_weights = {"morning": w_morning, "evening": w_evening, "night": w_night}
+    order = sorted(shift_weights, key=shift_weights.get)  # cheapest shift first
+    c1, c2, c3 = (shift_weights[shift] for shift in order)
+
+    # If day 0 = Monday, then day 5 = Saturday, day 6 = Sunday, etc.
+    n_weekend = int(np.count_nonzero((np.arange(num_workdays) % 7) >= 5))
+    n_weekday = num_workdays - n_weekend
+
+    def best_spread(k, n_days, peak, per_shift_extra):
+        # Cheapest (cost, days used, 2nd shifts, 3rd shifts) for every shift
+        # count in the array k on n_days, all candidates evaluated at once
+        lo = -(-k // peak)
+        hi = np.minimum(k, n_days)
+        u = np.sort(np.stack([lo, hi, k // 2, (k + 1) // 2]), axis=0)
+        second = np.minimum(k - u, u)
+        third = np.maximum(0, k - 2 * u)
+        cost = u * (w_daysUsed + c1) + second * c2 + third * c3 + k * per_shift_extra
+        cost = np.where((lo <= u) & (u <= hi), cost, np.inf)
+        i = np.argmin(cost, axis=0)  # ties go to the fewest days (u is sorted)
+        cols = np.arange(k.size)
+        return cost[i, cols], u[i, cols], second[i, cols], third[i, cols]
+
+    # Every (peak, weekday/weekend split) combination is priced in a single
+    # vectorized pass instead of a Python loop over the splits.
+    peaks, splits = [], []
+    for peak in range(1, 4):
+        if num_shifts <= peak * num_workdays:
+            k_min = max(0, num_shifts - peak * n_weekday)
+            k_max = min(num_shifts, peak * n_weekend)
+            peaks.append(np.full(k_max - k_min + 1, peak))
+            splits.append(np.arange(k_min, k_max + 1))
+    peaks = np.concatenate(peaks)
+    k_weekend = np.concatenate(splits)
+
+    weekday = best_spread(num_shifts - k_weekend, n_weekday, peaks, 0.0)
+    weekend = best_spread(k_weekend, n_weekend, peaks, w_weekend)
+    costs = w_staff * staff_per_shift * peaks + weekday[0] + weekend[0]
+    j = int(np.argmin(costs))  # ties go to the lowest peak
+
+    cost = float(costs[j])
+    tried_peak = int(peaks[j])
+    k_weekday, k_weekend = num_shifts - int(k_weekend[j]), int(k_weekend[j])
+    weekday = tuple(int(x[j]) for x in weekday[1:])
+    weekend = tuple(int(x[j]) for x in weekend[1:])
+    peak = max(
+        [-(-k // spread[0]) for k, spread in ((k_weekday, weekday), (k_weekend, weekend)) if k > 0],
+        default=0
+    )
+    counts = {
+        order[0]: weekday[0] + weekend[0],
+        order[1]: weekday[1] + weekend[1],
+        order[2]: weekday[2] + weekend[2],
+    }
+    return {
+        "morning_shifts": counts["morning"],
+        "evening_shifts": counts["evening"],
+        "night_shifts": counts["night"],
+        "min_staff": staff_per_shift * peak,
+        "days_used": weekday[0] + weekend[0],
+        "objective": cost - w_staff * staff_per_shift * (tried_peak - peak),
+    }
+
+
+def _solve_lp(batches_required, num_workdays, w_staff, w_night, w_weekend,
+              w_daysUsed, w_morning, w_evening, solver):
+    """
+    Solve the dispensing MILP with the given PuLP solver.
+
+    :return: (solver_status, dict of shift counts/staff/days used or None)
+    """
+    # ------------------------------------------------
+    # 1. REUSE THE CACHED MODEL FOR THIS HORIZON
+    # ------------------------------------------------
+    cached = _build_model(num_workdays)
+    model = cached["model"]
+    M_vars = cached["M_vars"]
+    E_vars = cached["E_vars"]
+    N_vars = cached["N_vars"]
+    staff_var = cached["staff_var"]
+    dayUsed = cached["dayUsed"]
+
+    # The cached model is shared between calls, so updating the objective/RHS,
+    # solving and reading the values back must not interleave.
+    with cached["lock"]:
+        # ------------------------------------------------
+        # 2. WEEKEND DAYS
+        # ------------------------------------------------
+        is_weekend = (np.arange(num_workdays) % 7) >= 5
+        # If day 0 = Monday, then day 5 = Saturday, day 6 = Sunday, day 12 = next Saturday, etc.
+
+        # ------------------------------------------------
+        # 3. OBJECTIVE FUNCTION
+        # ------------------------------------------------
+        # Accumulate one coefficient per variable and build the expression once,
+        # instead of merging five lpSum sub-expressions.
+        # Per-day shift coefficients come from the weekend mask in one go.
+        days = range(num_workdays)
+        weekend_cost = w_weekend * is_weekend
+        coeffs = {staff_var: w_staff}
+        for w_shift, shift_vars in ((w_morning, M_vars), (w_evening, E_vars), (w_night, N_vars)):
+            coeffs.update(zip((shift_vars[d] for d in days), (w_shift + weekend_cost).tolist()))
+        coeffs.update((dayUsed[d], w_daysUsed) for d in days)
+        model.setObjective(pulp.LpAffineExpression(coeffs.items()))
+        model.objective.name = "WeightedObjective"
+
+        # Only the demand RHS depends on batches_required
+        model.constraints["DemandConstraint"].changeRHS(batches_required)
+
+        # ------------------------------------------------
+        # 4. SOLVE THE MODEL
+        # ------------------------------------------------
+        model.solve(solver)  # returns the status code; compare on its LpStatus name below
+        solver_status = pulp.LpStatus[model.status]
+
+        # ------------------------------------------------
+        # 5. EXTRACT RESULTS
+        # ------------------------------------------------
+        # Read the values before releasing the cached model.
+        if solver_status != 'Optimal':
+            return solver_status, None
+        return solver_status, {
+            "morning_shifts": sum(round(M_vars[d].varValue) for d in range(num_workdays)),
+            "evening_shifts": sum(round(E_vars[d].varValue) for d in range(num_workdays)),
+            "night_shifts": sum(round(N_vars[d].varValue) for d in range(num_workdays)),
+            "min_staff": round(staff_var.varValue),
+            "days_used": sum(round(dayUsed[d].varValue) for d in range(num_workdays)),
+        }
+
 
 def optimize_dispensing(
     batches_required: int,
@@ -13,7 +274,9 @@ def optimize_dispensing(
     w_daysUsed: float = 1.0,
     w_morning: float = 0.0,   # penalty for morning shift usage
     w_evening: float = 0.1,   # penalty for evening shift usage
-    print_solution: bool = True
+    print_solution: bool = True,
+    use_lp: bool = False,
+    solver=None
 ):
     """
       - 3 shifts/day (morning M, evening E, night N)
@@ -38,13 +301,17 @@ def optimize_dispensing(
     :param w_morning: penalty for morning shift usage
     :param w_evening: penalty for evening shift usage
     :param print_solution: whether to print out the results
+    :param use_lp: solve the MILP with the configured solver instead of the
+                   closed-form schedule (kept for validation)
+    :param solver: PuLP solver for the MILP path (defaults to the one
+                   configured at startup)
     :return: dict with solution details or None if infeasible
     """
 
     # ------------------------------------------------
     # Quick feasibility check: 9 batches max per day
     # ------------------------------------------------
-    max_daily_batches = 9  # 3 shifts x 3 batches each
+    max_daily_batches = MAX_DAILY_BATCHES  # 3 shifts x 3 batches each
     if max_daily_batches * num_workdays < batches_required:
         # Infeasible from the start. We can't produce enough batches.
         if print_solution:
@@ -56,82 +323,24 @@ def optimize_dispensing(
             print(f"  => You need {more_days_needed} more day(s).")
         return None
 
-    # ------------------------------------------------
-    # 1. CREATE THE LP PROBLEM
-    # ------------------------------------------------
-    model = pulp.LpProblem("DispensingSchedule", pulp.LpMinimize)
-
-    # ------------------------------------------------
-    # 2. DECISION VARIABLES
-    # ------------------------------------------------
-    M_vars = {d: pulp.LpVariable(f"M_{d}", cat=pulp.LpBinary) for d in range(num_workdays)}
-    E_vars = {d: pulp.LpVariable(f"E_{d}", cat=pulp.LpBinary) for d in range(num_workdays)}
-    N_vars = {d: pulp.LpVariable(f"N_{d}", cat=pulp.LpBinary) for d in range(num_workdays)}
-
-    # Staff variable
-    staff_var = pulp.LpVariable("Staff", lowBound=0, cat=pulp.LpInteger)
-
-    # dayUsed variable (1 if any shift scheduled on day d, 0 otherwise)
-    dayUsed = {
-        d: pulp.LpVariable(f"dayUsed_{d}", cat=pulp.LpBinary)
-        for d in range(num_workdays)
-    }
-
-    # ------------------------------------------------
-    # 3. WEEKEND DAYS
-    # ------------------------------------------------
-    weekend_days = set(d for d in range(num_workdays) if d % 7 in [5, 6])
-    # If day 0 = Monday, then day 5 = Saturday, day 6 = Sunday, day 12 = next Saturday, etc.
-
-    # ------------------------------------------------
-    # 4. OBJECTIVE FUNCTION
-    # ------------------------------------------------
-    obj_night = w_night * pulp.lpSum(N_vars[d] for d in range(num_workdays))
-    obj_weekend = w_weekend * pulp.lpSum(
-        (M_vars[d] + E_vars[d] + N_vars[d]) for d in weekend_days
-    )
-    obj_daysUsed = w_daysUsed * pulp.lpSum(dayUsed[d] for d in range(num_workdays))
-    obj_morning = w_morning * pulp.lpSum(M_vars[d] for d in range(num_workdays))
-    obj_evening = w_evening * pulp.lpSum(E_vars[d] for d in range(num_workdays))
-
-    model += (
-        w_staff * staff_var + 
-        obj_night + 
-        obj_weekend + 
-        obj_daysUsed + 
-        obj_morning + 
-        obj_evening
-    ), "WeightedObjective"
-
-    # ------------------------------------------------
-    # 5. CONSTRAINTS
-    # ------------------------------------------------
-
-    # (a) Demand constraint
-    total_batches = pulp.lpSum(M_vars[d] + E_vars[d] + N_vars[d] for d in range(num_workdays)) * 3
-    model += (total_batches >= batches_required), "DemandConstraint"
-
-    # (b) Staff constraints
-    for d in range(num_workdays):
-        model += staff_var >= 6 * (M_vars[d] + E_vars[d] + N_vars[d]), f"StaffReq_{d}"
-
-    # (c) Link dayUsed[d] with shift usage
-    # If M_d + E_d + N_d >= 1, we want dayUsed[d] = 1
-    # We can enforce dayUsed[d] >= (M_d + E_d + N_d) / 3. 
-    # But since M/E/N are binary, any sum>0 => dayUsed=1. 
-    # A simpler approach is:
-    #   dayUsed[d] >= M_d, dayUsed[d] >= E_d, dayUsed[d] >= N_d
-    for d in range(num_workdays):
-        model += dayUsed[d] >= M_vars[d]
-        model += dayUsed[d] >= E_vars[d]
-        model += dayUsed[d] >= N_vars[d]
-    # This ensures that if any shift is used on day d, dayUsed[d] = 1.
-
-    # ------------------------------------------------
-    # 6. SOLVE THE MODEL
-    # ------------------------------------------------
-    result_status = model.solve(solver)
-    solver_status = pulp.LpStatus[model.status]
+    weights = (w_staff, w_night, w_weekend, w_daysUsed, w_morning, w_evening)
+    if use_lp or min(weights) < 0:
+        # Negative weights can make extra shifts attractive, which the
+        # closed form does not model; let the solver handle those.
+        solver_status, schedule = _solve_lp(
+            batches_required, num_workdays, w_staff, w_night, w_weekend,
+            w_daysUsed, w_morning, w_evening,
+            SOLVER_INSTANCE if solver is None else solver
+        )
+    else:
+        # ------------------------------------------------
+        # Closed-form optimum: 3 batches and 6 people per shift
+        # ------------------------------------------------
+        schedule = closed_form_schedule(
+            math.ceil(max(batches_required, 0) / 3), num_workdays, 6,
+            w_staff, w_morning, w_evening, w_night, w_weekend, w_daysUsed
+        )
+        solver_status = 'Optimal'
 
     if solver_status != 'Optimal':
         # Could be infeasible or unbounded for other reasons
@@ -144,23 +353,22 @@ def optimize_dispensing(
                 print(f"  => {more_days_needed} more day(s).")
         return None
 
-    # ------------------------------------------------
-    # 7. EXTRACT RESULTS
-    # ------------------------------------------------
-    morning_days = sum(int(M_vars[d].varValue) for d in range(num_workdays))
-    evening_days = sum(int(E_vars[d].varValue) for d in range(num_workdays))
-    night_days   = sum(int(N_vars[d].varValue) for d in range(num_workdays))
+    morning_days = schedule["morning_shifts"]
+    evening_days = schedule["evening_shifts"]
+    night_days   = schedule["night_shifts"]
+    min_staff = schedule["min_staff"]
+    used_days_count = schedule["days_used"]
 
-    min_staff = int(staff_var.varValue)
-    staff_with_buffer = math.ceil(min_staff * (1 + buffer_ratio))
+    # Round the buffer to a rational in thousandths and stay in integers:
+    # math.ceil(10 * 1.1) would give 12 because 10 * 1.1 == 11.000000000000002
+    buffer_permille = round((1 + buffer_ratio) * 1000)
+    staff_with_buffer = -(-min_staff * buffer_permille // 1000)
 
     total_produced = 3 * (morning_days + evening_days + night_days)
     pct_completed = (total_produced / batches_required) * 100 if batches_required > 0 else 0
 
-    used_days_count = sum(int(dayUsed[d].varValue) for d in range(num_workdays))
-
     # ------------------------------------------------
-    # 8. PRINT OR RETURN THE RESULTS
+    # PRINT OR RETURN THE RESULTS
     # ------------------------------------------------
     if print_solution:
         print("Optimal Schedule for Dispensing (Single Process):")
@@ -1,9 +1,191 @@
+import copy
 import math
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache, partial, wraps
+
+import numpy as np
 import pulp
+import Coating_PS
+import Dispensing_PS
+import Granulation_PS
+import Tab_PS
 from Dispensing_PS import optimize_dispensing
 from Granulation_PS import optimize_granulation
 from  Tab_PS import optimize_tableting
 from Coating_PS import optimize_coating
+from solver_setup import solver as SOLVER_INSTANCE
+
+
+def _memoized(optimizer):
+    """
+    Cache a sub-process optimizer on its arguments (all ints/floats/bools).
+
+    The batch and horizon searches, and repeated runs from the GUI, ask for the
+    same sub-schedules again and again; those become dict lookups instead of
+    new solves. Callers get a deep copy, so mutating a result (as the search
+    functions do) never alters the cached one.
+    """
+    cached = lru_cache(maxsize=512)(optimizer)
+
+    @wraps(optimizer)
+    def wrapper(*args, **kwargs):
+        return copy.deepcopy(cached(*args, **kwargs))
+
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+# Memoized sub-process optimizers (deep copies of cached results); the GUI
+# uses them too
+cached_optimize_dispensing = _memoized(optimize_dispensing)
+cached_optimize_granulation = _memoized(optimize_granulation)
+cached_optimize_tableting = _memoized(optimize_tableting)
+cached_optimize_coating = _memoized(optimize_coating)
+
+@dataclass(frozen=True)
+class ScheduleConfig:
+    """
+    Staff buffer, objective weights and machine selection shared by all four
+    processes of one schedule.
+
+    The searches below build it once and hand it to every probe instead of
+    re-passing the same dozen keyword arguments; being frozen it is hashable.
+    """
+    buffer_ratio: float = 0.0
+    # Common weights:
+    w_staff: float = 100.0
+    w_morning: float = 0.0
+    w_evening: float = 0.1
+    w_night: float = 2.0
+    w_weekend: float = 3.0
+    w_daysUsed: float = 1.0
+    # Tableting machine usage toggles:
+    use_p3030: bool = True
+    use_p3090i: bool = True
+    use_ima: bool = True
+    # Coating machine usage toggles:
+    use_bosch: bool = True
+    use_glatt: bool = True
+    # Schedule dispensing and coating in one model with a shared headcount:
+    joint_dispensing_coating: bool = False
+
+
+def _solve_osd_schedule(demands, num_workdays, config):
+    """
+    Solve the four sub-processes for (dispensing, granulation, tableting,
+    coating) batch demands and combine the results; None if any is infeasible.
+    """
+    disp_batches_req, gran_batches_req, tab_batches_req, coat_batches_req = demands
+    weights = dict(
+        buffer_ratio=config.buffer_ratio,
+        w_staff=config.w_staff,
+        w_morning=config.w_morning,
+        w_evening=config.w_evening,
+        w_night=config.w_night,
+        w_weekend=config.w_weekend,
+        w_daysUsed=config.w_daysUsed,
+        print_solution=False  # We'll handle printing in the combined summary
+    )
+
+    # The four sub-models are independent, so they are solved concurrently.
+    # The solvers spend their time outside the GIL (CBC in its own process,
+    # HiGHS in native code), so threads are enough to overlap them.
+    tasks = {
+        # 1) Dispensing
+        "dispensing": partial(
+            cached_optimize_dispensing,
+            batches_required=disp_batches_req,
+            num_workdays=num_workdays,
+            **weights
+        ),
+        # 2) Granulation
+        "granulation": partial(
+            cached_optimize_granulation,
+            batches_required=gran_batches_req,
+            num_workdays=num_workdays,
+            **weights
+        ),
+        # 3) Tableting
+        "tableting": partial(
+            cached_optimize_tableting,
+            batches_required=tab_batches_req,
+            num_workdays=num_workdays,
+            use_p3030=config.use_p3030,
+            use_p3090i=config.use_p3090i,
+            use_ima=config.use_ima,
+            **weights
+        ),
+        # 4) Coating
+        "coating": partial(
+            cached_optimize_coating,
+            batches_required=coat_batches_req,
+            num_workdays=num_workdays,
+            use_bosch=config.use_bosch,
+            use_glatt=config.use_glatt,
+            **weights
+        ),
+    }
+    if config.joint_dispensing_coating:
+        # 1) + 4) Dispensing and coating in one model (optimize_full_pipeline)
+        del tasks["dispensing"], tasks["coating"]
+        tasks["dispensing_coating"] = partial(
+            optimize_full_pipeline,
+            disp_batches_req=disp_batches_req,
+            coat_batches_req=coat_batches_req,
+            num_workdays=num_workdays,
+            use_bosch=config.use_bosch,
+            use_glatt=config.use_glatt,
+            **weights
+        )
+
+    results = {}
+    executor = ThreadPoolExecutor(max_workers=len(tasks))
+    try:
+        futures = {executor.submit(task): name for name, task in tasks.items()}
+        for future in as_completed(futures):
+            result = future.result()
+            # If any sub-process is infeasible the whole schedule is: stop early
+            if result is None:
+                return None  # or handle partial success
+            results[futures[future]] = result
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # -------------------------------------------------
+    # Combine results
+    # -------------------------------------------------
+    joint = results.pop("dispensing_coating", None)
+    if joint is not None:
+        results["dispensing"] = joint["dispensing"]
+        results["coating"] = joint["coating"]
+
+    combined_results = {
+        "dispensing": results["dispensing"],
+        "granulation": results["granulation"],
+        "tableting": results["tableting"],
+        "coating": results["coating"],
+    }
+
+    # Summarize total staff: each separate sub-problem has its own staff, a
+    # joint dispensing + coating model one shared headcount for both
+    staff_pools = [results["granulation"], results["tableting"]]
+    if joint is not None:
+        combined_results["dispensing_coating_min_staff"] = joint["min_staff_required"]
+        combined_results["dispensing_coating_staff_with_buffer"] = joint["staff_with_buffer"]
+        staff_pools.append(joint)
+    else:
+        staff_pools += [results["dispensing"], results["coating"]]
+    combined_results["total_min_staff_summed"] = sum(
+        result["min_staff_required"] for result in staff_pools
+    )
+    # Or staff with buffer:
+    combined_results["total_staff_with_buffer_summed"] = sum(
+        result["staff_with_buffer"] for result in staff_pools
+    )
+
+    return combined_results
 
 def optimize_osd_schedule(
     disp_batches_req: int,
@@ -27,42 +209,26 @@ def optimize_osd_schedule(
     # Coating machine usage toggles:
     use_bosch=True,
     use_glatt=True,
+    # Schedule dispensing and coating in one model with a shared headcount:
+    joint_dispensing_coating: bool = False,
     # Whether to print the big combined summary:
     print_combined: bool = True
 ):
     """
     Calls each of the 4 sub-process optimizers (dispensing, granulation, 
-    tableting, coating) in sequence with the given demands. Returns a 
+    tableting, coating) concurrently with the given demands. Returns a 
     consolidated dictionary of results, and can print a combined summary table.
 
     Note:
       - Each sub-optimizer is still an *independent* LP model, so staff are 
         not shared across processes in this approach. The total staff is just 
         the sum of staff from each sub-model. 
+      - With joint_dispensing_coating=True, dispensing and coating are solved
+        together by optimize_full_pipeline and share one daily headcount
+        (reported as 'dispensing_coating_min_staff'); the total staff then
+        counts that shared headcount once.
     """
-    
-    # 1) Run Dispensing
-    disp_result = optimize_dispensing(
-        batches_required=disp_batches_req,
-        num_workdays=num_workdays,
-        buffer_ratio=buffer_ratio,
-        w_staff=w_staff,
-        w_night=w_night,
-        w_weekend=w_weekend,
-        w_daysUsed=w_daysUsed,
-        w_morning=w_morning,
-        w_evening=w_evening,
-        print_solution=False  # We'll handle printing in the combined summary
-    )
-    
-    # If infeasible, disp_result will be None. We can short-circuit:
-    if disp_result is None:
-        return None  # or handle partial success
-
-    # 2) Run Granulation
-    gran_result = optimize_granulation(
-        batches_required=gran_batches_req,
-        num_workdays=num_workdays,
+    config = ScheduleConfig(
         buffer_ratio=buffer_ratio,
         w_staff=w_staff,
         w_morning=w_morning,
@@ -70,134 +236,82 @@ def optimize_osd_schedule(
         w_night=w_night,
         w_weekend=w_weekend,
         w_daysUsed=w_daysUsed,
-        print_solution=False
-    )
-    if gran_result is None:
-        return None
-
-    # 3) Run Tableting
-    tab_result = optimize_tableting(
-        batches_required=tab_batches_req,
-        num_workdays=num_workdays,
         use_p3030=use_p3030,
         use_p3090i=use_p3090i,
         use_ima=use_ima,
-        buffer_ratio=buffer_ratio,
-        w_staff=w_staff,
-        w_morning=w_morning,
-        w_evening=w_evening,
-        w_night=w_night,
-        w_weekend=w_weekend,
-        w_daysUsed=w_daysUsed,
-        print_solution=False
-    )
-    if tab_result is None:
-        return None
-
-    # 4) Run Coating
-    coat_result = optimize_coating(
-        batches_required=coat_batches_req,
-        num_workdays=num_workdays,
         use_bosch=use_bosch,
         use_glatt=use_glatt,
-        buffer_ratio=buffer_ratio,
-        w_staff=w_staff,
-        w_morning=w_morning,
-        w_evening=w_evening,
-        w_night=w_night,
-        w_weekend=w_weekend,
-        w_daysUsed=w_daysUsed,
-        print_solution=False
+        joint_dispensing_coating=joint_dispensing_coating,
     )
-    if coat_result is None:
+    combined_results = _solve_osd_schedule(
+        (disp_batches_req, gran_batches_req, tab_batches_req, coat_batches_req),
+        num_workdays, config
+    )
+    if combined_results is None:
         return None
 
-    # -------------------------------------------------
-    # Combine results
-    # -------------------------------------------------
-    combined_results = {
-        "dispensing": disp_result,
-        "granulation": gran_result,
-        "tableting": tab_result,
-        "coating": coat_result,
-    }
+    disp_result = combined_results["dispensing"]
+    gran_result = combined_results["granulation"]
+    tab_result = combined_results["tableting"]
+    coat_result = combined_results["coating"]
+    total_staff = combined_results["total_min_staff_summed"]
+    total_staff_with_buffer = combined_results["total_staff_with_buffer_summed"]
 
-    # Summarize total staff (remember: each sub-problem is separate right now)
-    total_staff = (
-        disp_result["min_staff_required"]
-        + gran_result["min_staff_required"]
-        + tab_result["min_staff_required"]
-        + coat_result["min_staff_required"]
-    )
-    # Or staff with buffer:
-    total_staff_with_buffer = (
-        disp_result["staff_with_buffer"]
-        + gran_result["staff_with_buffer"]
-        + tab_result["staff_with_buffer"]
-        + coat_result["staff_with_buffer"]
-    )
+    if print_combined:
+        lines = []
+        lines.append("\n" + "="*60)
+        lines.append("           Combined OSD Production Schedule")
+        lines.append("="*60)
+        lines.append(f"Time Horizon: {num_workdays} days")
+        lines.append("")
+        lines.append("1) Dispensing Results:")
+        lines.append("   -------------------")
+        lines.append(f"   Batches Required: {disp_batches_req}")
+        lines.append(f"   Batches Produced: {disp_result['total_batches_produced']}")
+        lines.append(f"   Staff (min)     : {disp_result['min_staff_required']}")
+        lines.append(f"   Days Used       : {disp_result['days_used']}")
+        lines.append(f"   Solver Status   : {disp_result['solver_status']}")
+        lines.append("")
 
-    # If you want to see how many total batches are produced across each process, you can track it,
-    # but note that each process has a separate measure. 
-    # For instance:
-    total_batches_dispensed = disp_result["total_batches_produced"]
-    total_batches_granulated = gran_result["total_batches_produced"]
-    total_batches_tableted   = tab_result["total_batches_produced"]  # "pct_demand_completed" also available
-    total_batches_coated    = coat_result["final_batches_count"]     # in Coating, we use final_batches_count
+        lines.append("2) Granulation Results:")
+        lines.append("   --------------------")
+        lines.append(f"   Batches Required: {gran_batches_req}")
+        lines.append(f"   Batches Produced: {gran_result['total_batches_produced']}")
+        lines.append(f"   Staff (min)     : {gran_result['min_staff_required']}")
+        lines.append(f"   Days Used       : {gran_result['days_used']}")
+        lines.append(f"   Solver Status   : {gran_result['solver_status']}")
+        lines.append("")
 
-    if print_combined:
-        print("\n" + "="*60)
-        print("           Combined OSD Production Schedule")
-        print("="*60)
-        print(f"Time Horizon: {num_workdays} days")
-        print()
-        print("1) Dispensing Results:")
-        print("   -------------------")
-        print(f"   Batches Required: {disp_batches_req}")
-        print(f"   Batches Produced: {disp_result['total_batches_produced']}")
-        print(f"   Staff (min)     : {disp_result['min_staff_required']}")
-        print(f"   Days Used       : {disp_result['days_used']}")
-        print(f"   Solver Status   : {disp_result['solver_status']}")
-        print()
-
-        print("2) Granulation Results:")
-        print("   --------------------")
-        print(f"   Batches Required: {gran_batches_req}")
-        print(f"   Batches Produced: {gran_result['total_batches_produced']}")
-        print(f"   Staff (min)     : {gran_result['min_staff_required']}")
-        print(f"   Days Used       : {gran_result['days_used']}")
-        print(f"   Solver Status   : {gran_result['solver_status']}")
-        print()
-
-        print("3) Tableting Results:")
-        print("   -------------------")
-        print(f"   Batches Required: {tab_batches_req}")
-        print(f"   Batches Produced: {tab_result['total_batches_produced']}")
-        print(f"   Staff (min)     : {tab_result['min_staff_required']}")
-        print(f"   Days Used       : {tab_result['days_used']}")
-        print(f"   Solver Status   : {tab_result['solver_status']}")
-        print()
-
-        print("4) Coating Results:")
-        print("   -----------------")
-        print(f"   Batches Required: {coat_batches_req}")
-        print(f"   Final Batches Produced: {coat_result['final_batches_count']} "
-              f"(Solution={coat_result['total_solution_produced']}, "
-              f"Coating={coat_result['total_coating_produced']})")
-        print(f"   Staff (min)     : {coat_result['min_staff_required']}")
-        print(f"   Days Used       : {coat_result['days_used']}")
-        print(f"   Solver Status   : {coat_result['solver_status']}")
-        print()
-        print("------------------------------------------------------------")
-        print(f"Approx. SUM of minimal staff across all 4 processes: {total_staff}")
-        print(f"Approx. SUM with buffer: {total_staff_with_buffer}")
-        print("------------------------------------------------------------")
-        print("="*60)
-        print()
-
-    # Optionally, add these "combined" fields to the dictionary:
-    combined_results["total_min_staff_summed"] = total_staff
-    combined_results["total_staff_with_buffer_summed"] = total_staff_with_buffer
+        lines.append("3) Tableting Results:")
+        lines.append("   -------------------")
+        lines.append(f"   Batches Required: {tab_batches_req}")
+        lines.append(f"   Batches Produced: {tab_result['total_batches_produced']}")
+        lines.append(f"   Staff (min)     : {tab_result['min_staff_required']}")
+        lines.append(f"   Days Used       : {tab_result['days_used']}")
+        lines.append(f"   Solver Status   : {tab_result['solver_status']}")
+        lines.append("")
+
+        lines.append("4) Coating Results:")
+        lines.append("   -----------------")
+        lines.append(f"   Batches Required: {coat_batches_req}")
+        lines.append(f"   Final Batches Produced: {coat_result['final_batches_count']} "
+                     f"(Solution={coat_result['total_solution_produced']}, "
+                     f"Coating={coat_result['total_coating_produced']})")
+        lines.append(f"   Staff (min)     : {coat_result['min_staff_required']}")
+        lines.append(f"   Days Used       : {coat_result['days_used']}")
+        lines.append(f"   Solver Status   : {coat_result['solver_status']}")
+        lines.append("")
+        lines.append("------------------------------------------------------------")
+        if joint_dispensing_coating:
+            lines.append(f"Shared staff of Dispensing + Coating: "
+                         f"{combined_results['dispensing_coating_min_staff']} "
+                         f"(with buffer: {combined_results['dispensing_coating_staff_with_buffer']})")
+        lines.append(f"Approx. SUM of minimal staff across all 4 processes: {total_staff}")
+        lines.append(f"Approx. SUM with buffer: {total_staff_with_buffer}")
+        lines.append("------------------------------------------------------------")
+        lines.append("="*60)
+        lines.append("")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     return combined_results
 
@@ -227,13 +341,7 @@ def optimize_osd_schedule_with_total(
     - Dictionary containing schedule details and total days needed
     - None if infeasible
     """
-    # First try with initial workdays estimate
-    result = optimize_osd_schedule(
-        disp_batches_req=total_batches,
-        gran_batches_req=total_batches,
-        tab_batches_req=total_batches,
-        coat_batches_req=total_batches,
-        num_workdays=initial_workdays,
+    config = ScheduleConfig(
         buffer_ratio=buffer_ratio,
         w_staff=w_staff,
         w_morning=w_morning,
@@ -246,33 +354,40 @@ def optimize_osd_schedule_with_total(
         use_ima=use_ima,
         use_bosch=use_bosch,
         use_glatt=use_glatt,
-        print_combined=False
     )
 
-    # If infeasible, try increasing workdays until we find a feasible solution
+    def run(num_workdays):
+        return _solve_osd_schedule((total_batches,) * 4, num_workdays, config)
+
+    # First try with initial workdays estimate
     current_days = initial_workdays
-    while result is None and current_days <= 365:  # 1 year max
-        current_days += 7  # Try adding a week at a time
-        result = optimize_osd_schedule(
-            disp_batches_req=total_batches,
-            gran_batches_req=total_batches,
-            tab_batches_req=total_batches,
-            coat_batches_req=total_batches,
-            num_workdays=current_days,
-            buffer_ratio=buffer_ratio,
-            w_staff=w_staff,
-            w_morning=w_morning,
-            w_evening=w_evening,
-            w_night=w_night,
-            w_weekend=w_weekend,
-            w_daysUsed=w_daysUsed,
-            use_p3030=use_p3030,
-            use_p3090i=use_p3090i,
-            use_ima=use_ima,
-            use_bosch=use_bosch,
-            use_glatt=use_glatt,
-            print_combined=False
-        )
+    result = run(current_days)
+
+    # If infeasible, search for the smallest feasible horizon up to a year.
+    # Feasibility only grows with the horizon (more days = more shifts), so:
+    # gallop outwards by 7, 14, 28, ... days (only horizons near the answer
+    # get solved), then binary search inside the last gap. That is O(log)
+    # solves instead of one per added week.
+    if result is None:
+        max_days = max(365, initial_workdays)  # 1 year max
+        infeasible_days, step = initial_workdays, 7
+        while result is None and infeasible_days < max_days:
+            probe_days = min(infeasible_days + step, max_days)
+            result = run(probe_days)
+            if result is None:
+                infeasible_days, step = probe_days, step * 2
+            else:
+                current_days = probe_days
+
+        lower_bound, upper_bound = infeasible_days + 1, current_days - 1
+        while result is not None and lower_bound <= upper_bound:
+            mid_days = (lower_bound + upper_bound) // 2
+            mid_result = run(mid_days)
+            if mid_result is not None:
+                result, current_days = mid_result, mid_days
+                upper_bound = mid_days - 1
+            else:
+                lower_bound = mid_days + 1
 
     if result is None:
         if print_combined:
@@ -299,20 +414,22 @@ def optimize_osd_schedule_with_total(
     result['workdays_allocated'] = current_days
 
     if print_combined:
-        print("\n" + "="*60)
-        print(f"Production Schedule for {total_batches} Total Batches")
-        print("="*60)
-        print(f"Total Days Needed: {total_days_needed} days")
-        print(f"Workdays Allocated: {current_days} days")
-        print("\nProcess Breakdown:")
-        print(f"Dispensing:   {disp_days} days")
-        print(f"Granulation:  {gran_days} days")
-        print(f"Tableting:    {tab_days} days")
-        print(f"Coating:      {coat_days} days")
-        print("\nStaffing Requirements:")
-        print(f"Total Staff (min): {result['total_min_staff_summed']}")
-        print(f"Total Staff (with buffer): {result['total_staff_with_buffer_summed']}")
-        print("="*60)
+        lines = []
+        lines.append("\n" + "="*60)
+        lines.append(f"Production Schedule for {total_batches} Total Batches")
+        lines.append("="*60)
+        lines.append(f"Total Days Needed: {total_days_needed} days")
+        lines.append(f"Workdays Allocated: {current_days} days")
+        lines.append("\nProcess Breakdown:")
+        lines.append(f"Dispensing:   {disp_days} days")
+        lines.append(f"Granulation:  {gran_days} days")
+        lines.append(f"Tableting:    {tab_days} days")
+        lines.append(f"Coating:      {coat_days} days")
+        lines.append("\nStaffing Requirements:")
+        lines.append(f"Total Staff (min): {result['total_min_staff_summed']}")
+        lines.append(f"Total Staff (with buffer): {result['total_staff_with_buffer_summed']}")
+        lines.append("="*60)
+        sys.stdout.write("\n".join(lines) + "\n")
 
     return result
 
@@ -330,60 +447,54 @@ def optimize_max_batches(
     use_ima=True,
     use_bosch=True,
     use_glatt=True,
-    max_iterations: int = 50,  # to prevent infinite loops
     print_solution: bool = True
 ) -> dict:
     """
-    Find the maximum number of batches that can be produced through all processes
-    using binary search approach.
-    
+    Find the maximum number of batches that can be produced through all processes.
+
+    Staff is a decision variable rather than a limit and the processes are
+    solved independently, so the answer is the capacity of the slowest
+    process (given the selected machines) over the horizon; it is solved once
+    to get the detailed schedule.
+
     Returns:
     - Dictionary containing the maximum feasible batches and the detailed schedule
     - None if no feasible solution found
     """
     
-    # Initialize binary search bounds
-    lower_bound = 1
-    upper_bound = num_workdays * 27  # Maximum theoretical (9 batches/day * 3 shifts)
+    config = ScheduleConfig(
+        buffer_ratio=buffer_ratio,
+        w_staff=w_staff,
+        w_morning=w_morning,
+        w_evening=w_evening,
+        w_night=w_night,
+        w_weekend=w_weekend,
+        w_daysUsed=w_daysUsed,
+        use_p3030=use_p3030,
+        use_p3090i=use_p3090i,
+        use_ima=use_ima,
+        use_bosch=use_bosch,
+        use_glatt=use_glatt,
+    )
+
+    # No process can exceed its daily capacity, so the slowest one bounds the
+    # whole line
+    max_feasible_batches = num_workdays * min(
+        Dispensing_PS.MAX_DAILY_BATCHES,
+        Granulation_PS.MAX_DAILY_BATCHES,
+        Tab_PS.daily_capacity(use_p3030, use_p3090i, use_ima),
+        Coating_PS.daily_capacity(use_bosch, use_glatt),
+    )
     max_feasible_result = None
-    max_feasible_batches = 0
-    
-    iteration = 0
-    while lower_bound <= upper_bound and iteration < max_iterations:
-        iteration += 1
-        current_batches = (lower_bound + upper_bound) // 2
-        
-        # Try to optimize with current batch target
-        result = optimize_osd_schedule(
-            disp_batches_req=current_batches,
-            gran_batches_req=current_batches,
-            tab_batches_req=current_batches,
-            coat_batches_req=current_batches,
-            num_workdays=num_workdays,
-            buffer_ratio=buffer_ratio,
-            w_staff=w_staff,
-            w_morning=w_morning,
-            w_evening=w_evening,
-            w_night=w_night,
-            w_weekend=w_weekend,
-            w_daysUsed=w_daysUsed,
-            use_p3030=use_p3030,
-            use_p3090i=use_p3090i,
-            use_ima=use_ima,
-            use_bosch=use_bosch,
-            use_glatt=use_glatt,
-            print_combined=False
-        )
-        
-        if result is not None:
-            # Solution is feasible, try more batches
-            lower_bound = current_batches + 1
-            max_feasible_result = result
-            max_feasible_batches = current_batches
-        else:
-            # Solution is infeasible, try fewer batches
-            upper_bound = current_batches - 1
-    
+    if max_feasible_batches >= 1:
+        max_feasible_result = _solve_osd_schedule((max_feasible_batches,) * 4, num_workdays, config)
+        if max_feasible_result is None:
+            # Every process can run at full capacity on its own, so this
+            # means one of the models (or the solver) is broken
+            raise RuntimeError(
+                f"Capacity bound of {max_feasible_batches} batches in {num_workdays} days is infeasible"
+            )
+
     if max_feasible_result is None:
         if print_solution:
             print("No feasible solution found!")
@@ -393,18 +504,19 @@ def optimize_max_batches(
     max_feasible_result['max_feasible_batches'] = max_feasible_batches
     
     if print_solution:
-        print("\n" + "="*70)
-        print(f"Maximum Feasible Production Schedule ({num_workdays} days)")
-        print("="*70)
-        print(f"Maximum Batches Achievable: {max_feasible_batches}")
-        print("\nProcess Breakdown:")
-        print("-----------------")
+        lines = []
+        lines.append("\n" + "="*70)
+        lines.append(f"Maximum Feasible Production Schedule ({num_workdays} days)")
+        lines.append("="*70)
+        lines.append(f"Maximum Batches Achievable: {max_feasible_batches}")
+        lines.append("\nProcess Breakdown:")
+        lines.append("-----------------")
         for process in ['dispensing', 'granulation', 'tableting', 'coating']:
             result = max_feasible_result[process]
-            print(f"\n{process.capitalize()}:")
-            print(f"  Batches Produced: {result.get('total_batches_produced', result.get('final_batches_count', 'N/A'))}")
-            print(f"  Staff Required : {result['min_staff_required']} (with buffer: {result['staff_with_buffer']})")
-            print(f"  Days Used     : {result['days_used']}")
+            lines.append(f"\n{process.capitalize()}:")
+            lines.append(f"  Batches Produced: {result.get('total_batches_produced', result.get('final_batches_count', 'N/A'))}")
+            lines.append(f"  Staff Required : {result['min_staff_required']} (with buffer: {result['staff_with_buffer']})")
+            lines.append(f"  Days Used     : {result['days_used']}")
             
             # Print shift distribution if available
             shifts = {
@@ -412,18 +524,236 @@ def optimize_max_batches(
                 'Evening': result.get('evening_shifts', 'N/A'),
                 'Night': result.get('night_shifts', 'N/A')
             }
-            print("  Shifts Distribution:")
+            lines.append("  Shifts Distribution:")
             for shift_type, count in shifts.items():
-                print(f"    {shift_type}: {count}")
+                lines.append(f"    {shift_type}: {count}")
         
-        print("\nTotal Resources Required:")
-        print("--------------------------")
-        print(f"Total Staff (minimum): {max_feasible_result['total_min_staff_summed']}")
-        print(f"Total Staff (with {int(buffer_ratio*100)}% buffer): {max_feasible_result['total_staff_with_buffer_summed']}")
-        print("="*70)
+        lines.append("\nTotal Resources Required:")
+        lines.append("--------------------------")
+        lines.append(f"Total Staff (minimum): {max_feasible_result['total_min_staff_summed']}")
+        lines.append(f"Total Staff (with {int(buffer_ratio*100)}% buffer): {max_feasible_result['total_staff_with_buffer_summed']}")
+        lines.append("="*70)
+        sys.stdout.write("\n".join(lines) + "\n")
     
     return max_feasible_result
 
+def optimize_full_pipeline(
+    disp_batches_req: int,
+    coat_batches_req: int,
+    num_workdays: int,
+    buffer_ratio: float = 0.0,
+    w_staff: float = 100.0,
+    w_morning: float = 0.0,
+    w_evening: float = 0.1,
+    w_night: float = 2.0,
+    w_weekend: float = 3.0,
+    w_daysUsed: float = 1.0,
+    use_bosch=True,
+    use_glatt=True,
+    print_solution: bool = True,
+    solver=None
+):
+    """
+    Schedule dispensing and coating together in ONE model.
+
+    Unlike optimize_osd_schedule (independent sub-models whose staff is
+    summed), the two processes share a single daily headcount here:
+      - dispensing shift => 3 batches, 6 people
+      - solution shift   => 4 solution-batches, 2 people
+      - coating machine (BOSCH/GLATT) running in a shift => 2 batches, 2 people
+      - staff >= people needed on ANY single day, summed over both processes
+      - coating cannot run ahead of dispensing: by the end of every day the
+        dispensed batches must cover the coated batches.
+    A day is "used" if either process runs on it. Shift, weekend and day
+    weights are the same as in the sub-process models.
+
+    :param disp_batches_req: batches demanded from dispensing
+    :param coat_batches_req: final batches demanded from coating
+    :param num_workdays: planning horizon in days
+    :param use_bosch: whether BOSCH is available
+    :param use_glatt: whether GLATT is available
+    :param print_solution: whether to print out the results
+    :param solver: PuLP solver to use (defaults to the one configured at startup)
+    :return: dict with per-process shift counts and the shared staff, or None
+             if infeasible
+    """
+    if solver is None:
+        solver = SOLVER_INSTANCE
+
+    coating_machines_used = int(use_bosch) + int(use_glatt)
+    if coating_machines_used == 0 and coat_batches_req > 0:
+        if print_solution:
+            print("No coating machines selected => cannot produce any coated batches. Infeasible.")
+        return None
+
+    # Same daily capacities as the sub-process models (3 shifts per day); every
+    # coated batch also has to be dispensed first, so dispensing caps coating.
+    if (9 * num_workdays < max(disp_batches_req, coat_batches_req)
+            or 12 * num_workdays < coat_batches_req
+            or 6 * coating_machines_used * num_workdays < coat_batches_req):
+        if print_solution:
+            print("No optimal solution found (Infeasible):")
+            print(f"  Demand cannot be met in {num_workdays} days at maximum daily capacity.")
+        return None
+
+    # ------------------------------------------------
+    # 1. VARIABLES
+    # ------------------------------------------------
+    model = pulp.LpProblem("DispensingCoatingSchedule", pulp.LpMinimize)
+    days = range(num_workdays)
+    shifts = ("M", "E", "N")
+
+    disp = {s: pulp.LpVariable.dicts(f"{s}_disp", days, cat=pulp.LpBinary) for s in shifts}
+    sol = {s: pulp.LpVariable.dicts(f"{s}_solution", days, cat=pulp.LpBinary) for s in shifts}
+    coat = {
+        s: pulp.LpVariable.dicts(f"{s}_coat", days, lowBound=0, upBound=coating_machines_used, cat=pulp.LpInteger)
+        for s in shifts
+    }
+    staff_var = pulp.LpVariable("Staff", lowBound=0, cat=pulp.LpInteger)
+    dayUsed = pulp.LpVariable.dicts("dayUsed", days, cat=pulp.LpBinary)
+
+    # ------------------------------------------------
+    # 2. OBJECTIVE
+    # ------------------------------------------------
+    is_weekend = (np.arange(num_workdays) % 7) >= 5
+    shift_weights = {"M": w_morning, "E": w_evening, "N": w_night}
+    objective_terms = [(staff_var, w_staff)]
+    objective_terms += [(dayUsed[d], w_daysUsed) for d in days]
+    for s in shifts:
+        coefs = (shift_weights[s] + w_weekend * is_weekend).tolist()
+        for X in (disp[s], sol[s], coat[s]):
+            objective_terms += [(X[d], coefs[d]) for d in days]
+    model.setObjective(pulp.LpAffineExpression(objective_terms))
+    model.objective.name = "WeightedObjective"
+
+    # ------------------------------------------------
+    # 3. CONSTRAINTS
+    # ------------------------------------------------
+    def add_row(terms, sense, rhs, name=None):
+        model.addConstraint(pulp.LpConstraint(pulp.LpAffineExpression(terms), sense, name, rhs))
+
+    # (a) Demands
+    add_row([(disp[s][d], 3) for s in shifts for d in days], pulp.LpConstraintGE, disp_batches_req, "DispensingDemand")
+    add_row([(sol[s][d], 4) for s in shifts for d in days], pulp.LpConstraintGE, coat_batches_req, "SolutionDemand")
+    add_row([(coat[s][d], 2) for s in shifts for d in days], pulp.LpConstraintGE, coat_batches_req, "CoatingDemand")
+
+    for d in days:
+        # (b) Shared headcount: Staff - 6*dispensing - 2*(solution + coating) >= 0
+        add_row(
+            [(staff_var, 1)]
+            + [(disp[s][d], -6) for s in shifts]
+            + [(X[s][d], -2) for X in (sol, coat) for s in shifts],
+            pulp.LpConstraintGE, 0, f"StaffDay_{d}"
+        )
+        # (c) Precedence: dispensed batches up to day d cover coated batches up to day d
+        add_row(
+            [(disp[s][t], 3) for s in shifts for t in range(d + 1)]
+            + [(coat[s][t], -2) for s in shifts for t in range(d + 1)],
+            pulp.LpConstraintGE, 0, f"Precedence_{d}"
+        )
+        # (d) dayUsed[d] = 1 if either process runs on day d
+        for s in shifts:
+            add_row([(dayUsed[d], 1), (disp[s][d], -1)], pulp.LpConstraintGE, 0)
+            add_row([(dayUsed[d], 1), (sol[s][d], -1)], pulp.LpConstraintGE, 0)
+            add_row([(dayUsed[d], max(coating_machines_used, 1)), (coat[s][d], -1)], pulp.LpConstraintGE, 0)
+
+    # ------------------------------------------------
+    # 4. SOLVE
+    # ------------------------------------------------
+    model.solve(solver)
+    solver_status = pulp.LpStatus[model.status]
+    if solver_status != 'Optimal':
+        if print_solution:
+            print(f"No optimal solution found! Solver status: {solver_status}")
+        return None
+
+    # ------------------------------------------------
+    # 5. EXTRACT RESULTS
+    # ------------------------------------------------
+    def total(X):
+        return sum(round(X[d].varValue) for d in days)
+
+    disp_counts = {s: total(disp[s]) for s in shifts}
+    sol_counts = {s: total(sol[s]) for s in shifts}
+    # BOSCH takes the first running machine of a shift (if selected), GLATT the rest
+    bosch_counts = {
+        s: sum(min(round(coat[s][d].varValue), 1) for d in days) if use_bosch else 0
+        for s in shifts
+    }
+    glatt_counts = {s: total(coat[s]) - bosch_counts[s] for s in shifts}
+
+    min_staff = round(staff_var.varValue)
+    buffer_permille = round((1 + buffer_ratio) * 1000)
+
+    def with_buffer(staff):
+        return -(-staff * buffer_permille // 1000)
+
+    staff_with_buffer = with_buffer(min_staff)
+    used_days_count = total(dayUsed)
+
+    # Each process's own busiest day and used days within the joint schedule
+    def day_shifts(*Xs):
+        return [sum(round(X[s][d].varValue) for X in Xs for s in shifts) for d in days]
+
+    disp_day_shifts = day_shifts(disp)
+    coat_day_shifts = day_shifts(sol, coat)
+    disp_staff = 6 * max(disp_day_shifts)
+    coat_staff = 2 * max(coat_day_shifts)
+
+    total_dispensed = 3 * sum(disp_counts.values())
+    total_solution_produced = 4 * sum(sol_counts.values())
+    total_coating_produced = 2 * (sum(bosch_counts.values()) + sum(glatt_counts.values()))
+    final_batches = min(total_solution_produced, total_coating_produced)
+
+    shift_names = {"M": "morning_shifts", "E": "evening_shifts", "N": "night_shifts"}
+    result = {
+        "dispensing": {
+            **{shift_names[s]: disp_counts[s] for s in shifts},
+            "total_batches_produced": total_dispensed,
+            "min_staff_required": disp_staff,
+            "staff_with_buffer": with_buffer(disp_staff),
+            "days_used": sum(n > 0 for n in disp_day_shifts),
+            "num_workdays_horizon": num_workdays,
+            "solver_status": solver_status,
+        },
+        "coating": {
+            **{
+                shift_names[s]: {"Solution": sol_counts[s], "BOSCH": bosch_counts[s], "GLATT": glatt_counts[s]}
+                for s in shifts
+            },
+            "total_solution_produced": total_solution_produced,
+            "total_coating_produced": total_coating_produced,
+            "final_batches_count": final_batches,
+            "min_staff_required": coat_staff,
+            "staff_with_buffer": with_buffer(coat_staff),
+            "days_used": sum(n > 0 for n in coat_day_shifts),
+            "num_workdays_horizon": num_workdays,
+            "solver_status": solver_status,
+        },
+        "min_staff_required": min_staff,
+        "staff_with_buffer": staff_with_buffer,
+        "days_used": used_days_count,
+        "num_workdays_horizon": num_workdays,
+        "solver_status": solver_status,
+    }
+
+    if print_solution:
+        lines = []
+        lines.append("Joint Schedule for Dispensing + Coating:")
+        lines.append("=" * 50)
+        lines.append(f"Number of Workdays in Horizon: {num_workdays}")
+        lines.append(f"Dispensing: {total_dispensed} batches "
+                     f"(M={disp_counts['M']}, E={disp_counts['E']}, N={disp_counts['N']})")
+        lines.append(f"Coating:    {final_batches} final batches "
+                     f"(Solution={total_solution_produced}, Coating={total_coating_produced})")
+        lines.append(f"Shared Minimal Headcount (no buffer): {min_staff}")
+        lines.append(f"Headcount with {int(buffer_ratio*100)}% buffer: {staff_with_buffer}")
+        lines.append(f"Number of days used: {used_days_count}")
+        lines.append("=" * 50)
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    return result
+
 # -------------
 # Example usage
 # -------------
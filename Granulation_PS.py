@@ -1,6 +1,157 @@
 import math
+import sys
+import threading
+from functools import lru_cache
+
+import numpy as np
 import pulp
-from PS_GUI3 import solver
+from Dispensing_PS import closed_form_schedule
+from solver_setup import solver
+
+# Mill + RC + Final Mix in parallel: 3 batches per shift, 3 shifts per day
+MAX_DAILY_BATCHES = 9
+
+@lru_cache(maxsize=32)
+def _build_model(num_workdays: int):
+    """
+    Build the structural part of the granulation model for a given horizon.
+
+    Only the objective and the demand RHS change between calls (e.g. the
+    successive probes of a batch/horizon search), so the model is built once
+    per horizon and just those two parts are updated before each re-solve.
+
+    :param num_workdays: how many days in this horizon
+    :return: dict with the model, its variables and a lock guarding re-solves
+    """
+    # ------------------------------------------------
+    # 1. CREATE THE LP PROBLEM
+    # ------------------------------------------------
+    model = pulp.LpProblem("GranulationSchedule", pulp.LpMinimize)
+
+    # ------------------------------------------------
+    # 2. DECISION VARIABLES
+    # ------------------------------------------------
+    days = range(num_workdays)
+    M_vars = pulp.LpVariable.dicts("M", days, cat=pulp.LpBinary)
+    E_vars = pulp.LpVariable.dicts("E", days, cat=pulp.LpBinary)
+    N_vars = pulp.LpVariable.dicts("N", days, cat=pulp.LpBinary)
+
+    # Staff variable
+    staff_var = pulp.LpVariable("Staff", lowBound=0, cat=pulp.LpInteger)
+
+    # dayUsed variable (1 if any shift scheduled on day d, 0 otherwise).
+    # Continuous is enough: it is only bounded below by the shift binaries, so
+    # the optimum puts it at max(M_d, E_d, N_d) (or at 1 if w_daysUsed < 0),
+    # which is integral, and the solver has a third fewer binaries to branch on.
+    dayUsed = pulp.LpVariable.dicts("dayUsed", days, lowBound=0, upBound=1)
+
+    # ------------------------------------------------
+    # 3. CONSTRAINTS
+    # ------------------------------------------------
+
+    # (a) Demand constraint
+    # Each shift can produce 3 batches, so total shifts * 3 must meet the demand.
+    # (the RHS is set per call in optimize_granulation)
+    model.addConstraint(pulp.LpConstraint(
+        pulp.LpAffineExpression([(X[d], 3) for X in (M_vars, E_vars, N_vars) for d in days]),
+        pulp.LpConstraintGE, "DemandConstraint", 0
+    ))
+
+    # (b) Staff constraints
+    # Each shift (M or E or N) requires 6 people in total (2 Mill + 2 RC + 2 FM).
+    for d in days:
+        model.addConstraint(pulp.LpConstraint(
+            pulp.LpAffineExpression([
+                (staff_var, 1), (M_vars[d], -6), (E_vars[d], -6), (N_vars[d], -6)
+            ]),
+            pulp.LpConstraintGE, f"StaffReq_{d}", 0
+        ))
+
+    # (c) Link dayUsed[d] with shift usage
+    # If M_d + E_d + N_d >= 1 => dayUsed[d] = 1
+    # We enforce dayUsed[d] >= M_d, E_d, N_d individually
+    for d in days:
+        for shift_var in (M_vars[d], E_vars[d], N_vars[d]):
+            model.addConstraint(pulp.LpConstraint(
+                pulp.LpAffineExpression([(dayUsed[d], 1), (shift_var, -1)]),
+                pulp.LpConstraintGE, rhs=0
+            ))
+
+    return {
+        "model": model,
+        "M_vars": M_vars,
+        "E_vars": E_vars,
+        "N_vars": N_vars,
+        "staff_var": staff_var,
+        "dayUsed": dayUsed,
+        "lock": threading.Lock(),
+    }
+
+def _solve_lp(batches_required, num_workdays, w_staff, w_morning, w_evening,
+              w_night, w_weekend, w_daysUsed):
+    """
+    Solve the granulation MILP with the configured solver.
+
+    :return: (solver_status, dict of shift counts/staff/days used or None)
+    """
+    # ------------------------------------------------
+    # 1. REUSE THE CACHED MODEL FOR THIS HORIZON
+    # ------------------------------------------------
+    cached = _build_model(num_workdays)
+    model = cached["model"]
+    M_vars = cached["M_vars"]
+    E_vars = cached["E_vars"]
+    N_vars = cached["N_vars"]
+    staff_var = cached["staff_var"]
+    dayUsed = cached["dayUsed"]
+
+    # The cached model is shared between calls, so updating the objective/RHS,
+    # solving and reading the values back must not interleave.
+    with cached["lock"]:
+        # ------------------------------------------------
+        # 2. WEEKEND DAYS
+        #   If day 0 = Monday, then day 5 (Sat) and day 6 (Sun) are weekend.
+        # ------------------------------------------------
+        is_weekend = (np.arange(num_workdays) % 7) >= 5
+
+        # ------------------------------------------------
+        # 3. OBJECTIVE FUNCTION
+        # ------------------------------------------------
+        # Shift penalty plus the weekend penalty on weekend days, per variable
+        days = range(num_workdays)
+        weekend_cost = w_weekend * is_weekend
+        coeffs = {staff_var: w_staff}
+        for w_shift, shift_vars in ((w_morning, M_vars), (w_evening, E_vars), (w_night, N_vars)):
+            coeffs.update(zip((shift_vars[d] for d in days), (w_shift + weekend_cost).tolist()))
+        coeffs.update((dayUsed[d], w_daysUsed) for d in days)
+        model.setObjective(pulp.LpAffineExpression(coeffs.items()))
+        model.objective.name = "WeightedObjective"
+
+        # Only the demand RHS depends on batches_required
+        model.constraints["DemandConstraint"].changeRHS(batches_required)
+
+        # ------------------------------------------------
+        # 4. SOLVE THE MODEL
+        # ------------------------------------------------
+        model.solve(solver)  # returns the status code; compare on its LpStatus name below
+        solver_status = pulp.LpStatus[model.status]
+
+        # ------------------------------------------------
+        # 5. EXTRACT RESULTS
+        # ------------------------------------------------
+        # Read the values before releasing the cached model.
+        if solver_status != 'Optimal':
+            return solver_status, None
+        return solver_status, {
+            "morning_shifts": sum(round(M_vars[d].varValue) for d in days),
+            "evening_shifts": sum(round(E_vars[d].varValue) for d in days),
+            "night_shifts": sum(round(N_vars[d].varValue) for d in days),
+            "min_staff": round(staff_var.varValue),
+            "days_used": sum(
+                1 for d in days
+                if round(M_vars[d].varValue) + round(E_vars[d].varValue) + round(N_vars[d].varValue) > 0
+            ),
+        }
 
 def optimize_granulation(
     batches_required: int,
@@ -12,7 +163,8 @@ def optimize_granulation(
     w_night: float = 2.0,
     w_weekend: float = 3.0,
     w_daysUsed: float = 1.0,
-    print_solution: bool = True
+    print_solution: bool = True,
+    use_lp: bool = False
 ):
     """
       Granulation Scheduling (3 sub-processes in parallel: Mill, RC, and Final Mix)
@@ -38,6 +190,8 @@ def optimize_granulation(
     :param w_weekend: penalty for each shift run on a weekend day
     :param w_daysUsed: penalty for each day that is used
     :param print_solution: whether to print out the results
+    :param use_lp: solve the MILP with the configured solver instead of the
+                   closed-form schedule (kept for validation)
     :return: dict with solution details or None if infeasible
     """
 
@@ -45,7 +199,7 @@ def optimize_granulation(
     # Quick feasibility check: 9 batches max per day
     #   (3 shifts per day * 3 batches per shift = 9)
     # ------------------------------------------------
-    max_daily_batches = 9
+    max_daily_batches = MAX_DAILY_BATCHES
     if max_daily_batches * num_workdays < batches_required:
         # Infeasible from the start. We can't produce enough batches.
         if print_solution:
@@ -57,81 +211,24 @@ def optimize_granulation(
             print(f"  => You need {more_days_needed} more day(s).")
         return None
 
-    # ------------------------------------------------
-    # 1. CREATE THE LP PROBLEM
-    # ------------------------------------------------
-    model = pulp.LpProblem("GranulationSchedule", pulp.LpMinimize)
-
-    # ------------------------------------------------
-    # 2. DECISION VARIABLES
-    # ------------------------------------------------
-    M_vars = {d: pulp.LpVariable(f"M_{d}", cat=pulp.LpBinary) for d in range(num_workdays)}
-    E_vars = {d: pulp.LpVariable(f"E_{d}", cat=pulp.LpBinary) for d in range(num_workdays)}
-    N_vars = {d: pulp.LpVariable(f"N_{d}", cat=pulp.LpBinary) for d in range(num_workdays)}
-
-    # Staff variable
-    staff_var = pulp.LpVariable("Staff", lowBound=0, cat=pulp.LpInteger)
-
-    # dayUsed variable (1 if any shift scheduled on day d, 0 otherwise)
-    dayUsed = {
-        d: pulp.LpVariable(f"dayUsed_{d}", cat=pulp.LpBinary)
-        for d in range(num_workdays)
-    }
-
-    # ------------------------------------------------
-    # 3. WEEKEND DAYS
-    #   If day 0 = Monday, then day 5 (Sat) and day 6 (Sun) are weekend.
-    # ------------------------------------------------
-    weekend_days = set(d for d in range(num_workdays) if d % 7 in [5, 6])
-
-    # ------------------------------------------------
-    # 4. OBJECTIVE FUNCTION
-    # ------------------------------------------------
-    # Updated weighted sum to include morning and evening penalties
-    obj_morning = w_morning * pulp.lpSum(M_vars[d] for d in range(num_workdays))
-    obj_evening = w_evening * pulp.lpSum(E_vars[d] for d in range(num_workdays))
-    obj_night = w_night * pulp.lpSum(N_vars[d] for d in range(num_workdays))
-    obj_weekend = w_weekend * pulp.lpSum(
-        (M_vars[d] + E_vars[d] + N_vars[d]) for d in weekend_days
-    )
-    obj_daysUsed = w_daysUsed * pulp.lpSum(dayUsed[d] for d in range(num_workdays))
-
-    model += (
-        w_staff * staff_var + 
-        obj_morning + 
-        obj_evening + 
-        obj_night + 
-        obj_weekend + 
-        obj_daysUsed
-    ), "WeightedObjective"
-
-    # ------------------------------------------------
-    # 5. CONSTRAINTS
-    # ------------------------------------------------
-
-    # (a) Demand constraint
-    # Each shift can produce 3 batches, so total shifts * 3 must meet the demand.
-    total_batches = pulp.lpSum(M_vars[d] + E_vars[d] + N_vars[d] for d in range(num_workdays)) * 3
-    model += (total_batches >= batches_required), "DemandConstraint"
-
-    # (b) Staff constraints
-    # Each shift (M or E or N) requires 6 people in total (2 Mill + 2 RC + 2 FM).
-    for d in range(num_workdays):
-        model += staff_var >= 6 * (M_vars[d] + E_vars[d] + N_vars[d]), f"StaffReq_{d}"
-
-    # (c) Link dayUsed[d] with shift usage
-    # If M_d + E_d + N_d >= 1 => dayUsed[d] = 1
-    # We enforce dayUsed[d] >= M_d, E_d, N_d individually
-    for d in range(num_workdays):
-        model += dayUsed[d] >= M_vars[d]
-        model += dayUsed[d] >= E_vars[d]
-        model += dayUsed[d] >= N_vars[d]
-
-    # ------------------------------------------------
-    # 6. SOLVE THE MODEL
-    # ------------------------------------------------
-    result_status = model.solve(solver)
-    solver_status = pulp.LpStatus[model.status]
+    weights = (w_staff, w_morning, w_evening, w_night, w_weekend, w_daysUsed)
+    if use_lp or min(weights) < 0:
+        # Negative weights can make extra shifts attractive, which the
+        # closed form does not model; let the solver handle those.
+        solver_status, schedule = _solve_lp(
+            batches_required, num_workdays, w_staff, w_morning, w_evening,
+            w_night, w_weekend, w_daysUsed
+        )
+    else:
+        # ------------------------------------------------
+        # Closed-form optimum: same shift structure as dispensing
+        #   (3 batches and 6 people per shift, 3 shifts/day)
+        # ------------------------------------------------
+        schedule = closed_form_schedule(
+            math.ceil(max(batches_required, 0) / 3), num_workdays, 6,
+            w_staff, w_morning, w_evening, w_night, w_weekend, w_daysUsed
+        )
+        solver_status = 'Optimal'
 
     if solver_status != 'Optimal':
         # Could be infeasible or unbounded
@@ -144,43 +241,43 @@ def optimize_granulation(
                 print(f"  => {more_days_needed} more day(s).")
         return None
 
-    # ------------------------------------------------
-    # 7. EXTRACT RESULTS
-    # ------------------------------------------------
-    morning_days = sum(int(M_vars[d].varValue) for d in range(num_workdays))
-    evening_days = sum(int(E_vars[d].varValue) for d in range(num_workdays))
-    night_days   = sum(int(N_vars[d].varValue) for d in range(num_workdays))
+    morning_days = schedule["morning_shifts"]
+    evening_days = schedule["evening_shifts"]
+    night_days   = schedule["night_shifts"]
+    min_staff = schedule["min_staff"]
+    used_days_count = schedule["days_used"]
 
-    min_staff = int(staff_var.varValue)
-    staff_with_buffer = math.ceil(min_staff * (1 + buffer_ratio))
+    # Integer ceil with the buffer in thousandths (no float rounding surprises)
+    buffer_permille = round((1 + buffer_ratio) * 1000)
+    staff_with_buffer = -(-min_staff * buffer_permille // 1000)
 
     total_produced = 3 * (morning_days + evening_days + night_days)
     pct_completed = (total_produced / batches_required) * 100 if batches_required > 0 else 0
 
-    used_days_count = sum(int(dayUsed[d].varValue) for d in range(num_workdays))
-
     # ------------------------------------------------
-    # 8. PRINT OR RETURN THE RESULTS
+    # PRINT OR RETURN THE RESULTS
     # ------------------------------------------------
     if print_solution:
-        print("Optimal Schedule for Granulation (3 Sub-processes in Parallel):")
-        print("=================================================================")
-        print(f"Number of Workdays in Horizon: {num_workdays}")
-        print(f"Demanded Batches: {batches_required}")
-        print()
-        print("Shifts Summary:")
-        print(f"  Morning shifts: {morning_days}")
-        print(f"  Evening shifts: {evening_days}")
-        print(f"  Night   shifts: {night_days}")
-        print()
-        print(f"Total Batches Produced: {total_produced}")
-        print(f"% of Demand Completed:  {pct_completed:.1f}%")
-        print()
-        print(f"Minimal Headcount (no buffer): {min_staff}")
-        print(f"Headcount with {int(buffer_ratio*100)}% buffer: {staff_with_buffer}")
-        print()
-        print(f"Number of days used: {used_days_count}")
-        print("=" * 65)
+        lines = []
+        lines.append("Optimal Schedule for Granulation (3 Sub-processes in Parallel):")
+        lines.append("=================================================================")
+        lines.append(f"Number of Workdays in Horizon: {num_workdays}")
+        lines.append(f"Demanded Batches: {batches_required}")
+        lines.append("")
+        lines.append("Shifts Summary:")
+        lines.append(f"  Morning shifts: {morning_days}")
+        lines.append(f"  Evening shifts: {evening_days}")
+        lines.append(f"  Night   shifts: {night_days}")
+        lines.append("")
+        lines.append(f"Total Batches Produced: {total_produced}")
+        lines.append(f"% of Demand Completed:  {pct_completed:.1f}%")
+        lines.append("")
+        lines.append(f"Minimal Headcount (no buffer): {min_staff}")
+        lines.append(f"Headcount with {int(buffer_ratio*100)}% buffer: {staff_with_buffer}")
+        lines.append("")
+        lines.append(f"Number of days used: {used_days_count}")
+        lines.append("=" * 65)
+        sys.stdout.write("\n".join(lines) + "\n")
 
     return {
         "morning_shifts": morning_days,
@@ -1,104 +1,183 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, StringVar, DoubleVar, IntVar
-import pandas as pd
 from Formulation_PS import optimize_osd_schedule, optimize_osd_schedule_with_total, optimize_max_batches
-from Dispensing_PS import optimize_dispensing
-from Granulation_PS import optimize_granulation
-from  Tab_PS import optimize_tableting
-from Coating_PS import optimize_coating
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+# The memoized sub-process optimizers (keyed on all their arguments), so
+# pressing Calculate again with unchanged inputs does not re-solve anything
+from Formulation_PS import (
+    cached_optimize_dispensing,
+    cached_optimize_granulation,
+    cached_optimize_tableting,
+    cached_optimize_coating,
+)
 import json
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import pulp
-import os
-import sys
-from pulp import COIN_CMD
-
-def get_cbc_path():
-    """Get the path to the CBC solver executable."""
-    if getattr(sys, 'frozen', False):  # If running as a PyInstaller bundle
-        base_path = sys._MEIPASS
-    else:
-        base_path = os.path.dirname(os.path.abspath(__file__))
-    return os.path.join(base_path, 'solver', 'cbc.exe')
-
-def setup_pulp_solver():
-    """Set up and configure the PuLP solver with CBC.
-    
-    Returns:
-        The configured solver instance.
-        
-    Raises:
-        FileNotFoundError: If CBC solver is not found.
-        Exception: If no working solver is available.
-    """
-    try:
-        # Get the path to CBC solver
-        cbc_path = get_cbc_path()
-        print(f"Looking for CBC solver at: {cbc_path}")
-        
-        if not os.path.exists(cbc_path):
-            raise FileNotFoundError(f"CBC solver not found at: {cbc_path}")
-            
-        # Verify solver is executable
-        if not os.access(cbc_path, os.X_OK):
-            print("Warning: CBC solver exists but may not be executable")
-            
-        # Configure PuLP to use the found CBC solver
-        solver = pulp.COIN_CMD(path=cbc_path, msg=False)  # Set msg=False to suppress solver output
-        
-        # Test the solver with a simple problem
-        test_prob = pulp.LpProblem("test", pulp.LpMinimize)
-        x = pulp.LpVariable("x", 0, 1)
-        test_prob += x
-        status = test_prob.solve(solver)
-        
-        if status == pulp.LpStatusOptimal:
-            print("CBC solver test successful")
-            return solver
-        else:
-            print(f"CBC solver test failed with status: {pulp.LpStatus[status]}")
-            raise Exception("CBC solver test failed")
-            
-    except Exception as e:
-        print(f"Error setting up CBC solver: {str(e)}")
-        print("Attempting to use system solver as fallback...")
-        
-        try:
-            # Try to use any available solver
-            available_solvers = []
-            unavailable_solvers = set()
-            
-            for solver_name in pulp.listSolvers(onlyAvailable=False):
-                try:
-                    if pulp.getSolver(solver_name).available():
-                        available_solvers.append(solver_name)
-                    else:
-                        unavailable_solvers.add(solver_name)
-                except:
-                    unavailable_solvers.add(solver_name)
-            
-            print(f"Available solvers: {available_solvers}")
-            print(f"Unavailable solvers: {unavailable_solvers}")
-            
-            if available_solvers:
-                # Try to use the first available solver
-                solver = pulp.getSolver(available_solvers[0])
-                print(f"Using alternative solver: {available_solvers[0]}")
-                return solver
-            else:
-                raise Exception("No working solvers found")
-        except Exception as e2:
-            print(f"Failed to use system solver: {str(e2)}")
-            raise Exception("No working solver found") from e
-
-# Call this function at startup and store the solver instance
-solver = setup_pulp_solver()
+from solver_setup import solver
 
 # Make the solver instance available to other modules
 __all__ = ['solver']
 
+# Entry validation per type: (keystroke pattern, range check, error message).
+# The pattern accepts every prefix of a valid value (including ""), so it can
+# run on each keypress; the range check runs on the complete value.
+_VALIDATORS = {
+    'positive_int': (re.compile(r'\d*'), lambda v: v >= 0, "Value must be positive"),
+    'positive_float': (re.compile(r'\d*\.?\d*'), lambda v: v >= 0, "Value cannot be negative"),
+    'percentage': (re.compile(r'(100(\.0*)?|\d{1,2}(\.\d*)?)?'), lambda v: 0 <= v <= 100,
+                   "Percentage must be between 0 and 100"),
+    'weight': (re.compile(r'\d*\.?\d*'), lambda v: v >= 0, "Weight cannot be negative"),
+}
+
+# Row height (px) per text line in the detailed results table
+DETAIL_LINE_HEIGHT = 20
+
+# Result table columns: (heading, width in px, anchor)
+SUMMARY_COLUMNS = (
+    ('Process', 120, 'center'),
+    ('Staff Required', 120, 'center'),
+    ('With Buffer', 120, 'center'),
+    ('Days Used', 120, 'center'),
+    ('Batches Produced', 120, 'center'),
+    ('Status', 120, 'center'),
+)
+DETAILED_COLUMNS = (
+    ('Process', 120, 'center'),
+    ('Morning Shifts', 120, 'center'),
+    ('Evening Shifts', 120, 'center'),
+    ('Night Shifts', 120, 'center'),
+    ('Machine Details', 150, 'w'),  # Left align for better readability
+)
+SHIFT_COLUMNS = (
+    ('Process', 120, 'center'),
+    ('Total Shifts', 120, 'center'),
+    ('Morning %', 120, 'center'),
+    ('Evening %', 120, 'center'),
+    ('Night %', 120, 'center'),
+)
+
+# Scenario comparison table, left-aligned like Tk's default
+COMPARISON_COLUMNS = (
+    ('Scenario', 120, 'w'),
+    ('Type', 120, 'w'),
+    ('Time', 120, 'w'),
+    ('Staff Required', 120, 'w'),
+    ('Staff with Buffer', 120, 'w'),
+    ('Days Used', 120, 'w'),
+    ('Batches Produced', 120, 'w'),
+)
+
+# Machines each process reports its shifts for. The optimizers fix the shape
+# of the shift entries per process: plain counts for the processes mapped to
+# None, per-machine dicts for the others.
+PROCESS_MACHINES = {
+    'dispensing': None,
+    'granulation': None,
+    'tableting': frozenset(('P3030', 'P3090i', 'IMA')),
+    'coating': frozenset(('Solution', 'BOSCH', 'GLATT')),
+}
+
+def _aggregate_shifts(morning_shifts, evening_shifts, night_shifts, machines):
+    """
+    Sum a per-machine shift breakdown (Tableting/Coating results) in one pass
+    over the machines present in the result.
+
+    :param machines: set of the process's machine names
+    :return: (morning, evening, night, machine_counts) where machine_counts
+             holds the total shifts of each of those machines, in result order
+    """
+    evening_get, night_get = evening_shifts.get, night_shifts.get
+    # (morning, evening, night) of each machine
+    shifts = {
+        machine: (machine_morning, evening_get(machine, 0), night_get(machine, 0))
+        for machine, machine_morning in morning_shifts.items() if machine in machines
+    }
+    machine_counts = {machine: sum(counts) for machine, counts in shifts.items()}
+    morning, evening, night = (sum(column) for column in zip(*shifts.values())) if shifts else (0, 0, 0)
+    return morning, evening, night, machine_counts
+
+def _process_shifts(process, result):
+    """
+    Morning/evening/night shift totals of one process result, computed once
+    for all the tables that show them.
+
+    :return: (morning, evening, night, machine_counts); machine_counts is None
+             for processes without a per-machine breakdown
+    """
+    morning = result.get('morning_shifts', 0)
+    evening = result.get('evening_shifts', 0)
+    night = result.get('night_shifts', 0)
+    machines = PROCESS_MACHINES.get(process.lower())
+    if machines is not None:
+        return _aggregate_shifts(morning, evening, night, machines)
+    return morning, evening, night, None
+
+def _detail_and_shift_rows(items):
+    """
+    Rows of the Detailed Results and Shift Distribution tables, both rows of a
+    process from one pass over its shift totals.
+
+    :param items: (process name, result) pairs; only solved processes get rows
+    :return: (detailed_rows, shift_rows)
+    """
+    detailed_rows = []
+    shift_rows = []
+    for process, result in items:
+        if not result or result.get('solver_status') != 'Optimal':
+            continue
+        morning, evening, night, machine_counts = _process_shifts(process, result)
+        
+        if machine_counts is not None:
+            # Format the machine details string with newlines
+            machine_details = "\n".join(
+                f"{machine}: {count}" for machine, count in machine_counts.items() if count > 0
+            )
+        else:
+            machine_details = "N/A"  # No machine details for these processes
+        
+        detailed_rows.append((
+            process,
+            morning,
+            evening,
+            night,
+            machine_details
+        ))
+        
+        total = morning + evening + night
+        if total > 0:
+            # One scale factor for the three shares
+            scale = 100.0 / total
+            shift_rows.append((
+                process,
+                total,
+                f"{morning * scale:.1f}%",
+                f"{evening * scale:.1f}%",
+                f"{night * scale:.1f}%"
+            ))
+    return detailed_rows, shift_rows
+
+def _summary_totals(rows):
+    """
+    Scenario totals of a summary table's rows: staff and batches summed over
+    the feasible processes, days as the longest of them.
+    """
+    total_staff = 0
+    total_staff_buffer = 0
+    total_days = 0
+    total_batches = 0
+    for values in rows:
+        if values[1] != 'N/A':  # Skip infeasible results
+            total_staff += int(values[1])  # Staff Required
+            total_staff_buffer += int(values[2])  # With Buffer
+            total_days = max(total_days, int(values[3]))  # Days Used
+            total_batches += int(values[4])  # Batches Produced
+    return {
+        'staff_required': total_staff,
+        'staff_with_buffer': total_staff_buffer,
+        'days_used': total_days,
+        'batches_produced': total_batches
+    }
+
 class ModernProductionSchedulerGUI:
     def __init__(self, root):
         self.root = root
@@ -138,11 +217,43 @@ class ModernProductionSchedulerGUI:
         # Setup styles
         self.setup_styles()
         
+        # One tooltip window, reused by every tooltip
+        self.create_tooltip_window()
+        
         # Create main layout AFTER initializing variables
         self.create_main_layout()
 
-        # Add dictionary to store scenarios
+        # Add dictionary to store scenarios, plus the serialized inputs/results
+        # of each one so an unchanged scenario isn't stored twice
         self.scenarios = {}
+        self.scenario_keys = {}
+        
+        # Comparison chart of the saved scenarios, drawn on the worker pool on
+        # first view (chart_future while pending) and dropped whenever the
+        # scenarios change
+        self.chart_figure = None
+        self.chart_future = None
+        
+        # Widgets of the scenario comparison window, kept (hidden when closed)
+        # and refreshed on the next comparison
+        self.comparison = None
+        
+        # Results panel currently shown (None once cleared)
+        self.results_frame = None
+        
+        # Widgets of the individual-process results panel, once built
+        self.results_table = None
+        self.pending_results = None
+        
+        # (results frame, results) last rendered, to skip identical redraws
+        self.shown_results = None
+        
+        # (results frame, totals of its summary table) last rendered, for
+        # saving scenarios
+        self.summary_totals = None
+        
+        # Worker threads for the optimizer calls, off the Tk main thread
+        self.pool = ThreadPoolExecutor(max_workers=4)
         
         # Add scenario comparison button to each tab
         self.add_scenario_buttons()
@@ -169,6 +280,21 @@ class ModernProductionSchedulerGUI:
         style.configure('TNotebook.Tab', 
                        padding=[12, 8],    # Increased padding
                        font=('Helvetica', 12, 'bold'))  # Increased font size and made bold
+        
+        # Results: summary cards
+        style.configure('Card.TFrame', background=self.colors['bg'])
+        style.configure('CardTitle.TLabel',
+                       font=('Helvetica', 14, 'bold'),
+                       foreground=self.colors['primary'],
+                       background=self.colors['bg'])
+        style.configure('CardValue.TLabel',
+                       font=('Helvetica', 24, 'bold'),
+                       foreground=self.colors['secondary'],
+                       background=self.colors['bg'])
+        
+        # Results: the detailed table's row height follows its tallest
+        # Machine Details cell (see fit_detail_rows), one line until then
+        style.configure("Multiline.Treeview", rowheight=DETAIL_LINE_HEIGHT)
 
     def create_main_layout(self):
         """Create the main layout of the application"""
@@ -196,19 +322,54 @@ class ModernProductionSchedulerGUI:
         self.notebook = ttk.Notebook(self.main_frame)
         self.notebook.pack(fill=tk.BOTH, expand=True, pady=10)
         
-        # Create tabs
+        # Create tabs (only the selected one gets its content right away)
+        self.tabs = {}
+        self.tab_builders = {}
         self.create_individual_tab()
         self.create_uniform_tab()
         self.create_maximum_tab()
         
+        # One Common Parameters section, shared by the three tabs and moved into
+        # the selected one (created after the tabs so it stacks above them)
+        self.common_params_slots = {}
+        self.common_params_frame = self.create_common_parameters(self.notebook)
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.on_tab_changed()
+        
         # Configure scrolling
+        self.scroll_delta = 0
+        self.scroll_pending = None
+        self.scroll_size = None
         self.main_frame.bind("<Configure>", self.on_frame_configure)
         self.canvas.bind("<Configure>", self.on_canvas_configure)
         self.canvas.bind_all("<MouseWheel>", self.on_mousewheel)
 
+    def on_tab_changed(self, event=None):
+        """Build a tab's content the first time it is selected and show the
+        common parameters in it"""
+        current_tab = self.notebook.select()
+        builder = self.tab_builders.pop(current_tab, None)
+        if builder is not None:
+            builder()
+        
+        # Packed into the tab's content frame, just above its buttons
+        button_frame = self.common_params_slots[current_tab]
+        self.common_params_frame.pack(in_=button_frame.master, before=button_frame,
+                                      fill='x', pady=10)
+        self.common_params_frame.lift()
+
     def on_frame_configure(self, event=None):
         """Reset the scroll region to encompass the inner frame"""
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        # The frame is the canvas' only item, anchored at (0, 0), so its size
+        # is the scroll region: no bbox("all") walk, and no reconfigure (and
+        # redraw) unless the size actually changed
+        if event is not None:
+            size = (event.width, event.height)
+        else:
+            size = (self.main_frame.winfo_width(), self.main_frame.winfo_height())
+        if size != self.scroll_size:
+            self.scroll_size = size
+            self.canvas.configure(scrollregion=(0, 0) + size)
 
     def on_canvas_configure(self, event):
         """When the canvas is resized, resize the window within it too"""
@@ -216,7 +377,26 @@ class ModernProductionSchedulerGUI:
 
     def on_mousewheel(self, event):
         """Handle mouse wheel scrolling"""
-        self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        # The binding is global: ignore wheel events over other windows
+        # (e.g. the scenario comparison)
+        try:
+            if event.widget.winfo_toplevel() is not self.root:
+                return
+        except (AttributeError, KeyError):
+            return
+        
+        # Coalesce a burst of wheel ticks into at most one scroll per frame
+        self.scroll_delta += event.delta
+        if self.scroll_pending is None:
+            self.scroll_pending = self.root.after(16, self.flush_scroll)
+
+    def flush_scroll(self):
+        """Apply the wheel movement accumulated since the last frame"""
+        self.scroll_pending = None
+        units = int(-1*(self.scroll_delta/120))
+        self.scroll_delta += units*120  # keep the remainder of partial ticks
+        if units:
+            self.canvas.yview_scroll(units, "units")
 
     def create_header(self):
         """Create the header section with title and description"""
@@ -240,6 +420,7 @@ class ModernProductionSchedulerGUI:
         """Create the Individual Processes tab"""
         tab = ttk.Frame(self.notebook, style='Tab.TFrame')
         self.notebook.add(tab, text='Individual Processes')
+        self.tabs['individual'] = tab
         
         # Add description
         desc = ttk.Label(tab,
@@ -248,13 +429,14 @@ class ModernProductionSchedulerGUI:
                         wraplength=700)
         desc.pack(pady=10)
         
-        # Content will be added later
-        self.create_individual_content(tab)
+        # Content is built when the tab is first selected
+        self.tab_builders[str(tab)] = lambda: self.create_individual_content(tab)
 
     def create_uniform_tab(self):
         """Create the Uniform Production tab"""
         tab = ttk.Frame(self.notebook, style='Tab.TFrame')
         self.notebook.add(tab, text='Uniform Production')
+        self.tabs['uniform'] = tab
         
         # Add description
         desc = ttk.Label(tab,
@@ -263,13 +445,14 @@ class ModernProductionSchedulerGUI:
                         wraplength=700)
         desc.pack(pady=10)
         
-        # Content will be added later
-        self.create_uniform_content(tab)
+        # Content is built when the tab is first selected
+        self.tab_builders[str(tab)] = lambda: self.create_uniform_content(tab)
 
     def create_maximum_tab(self):
         """Create the Maximum Production tab"""
         tab = ttk.Frame(self.notebook, style='Tab.TFrame')
         self.notebook.add(tab, text='Maximum Production')
+        self.tabs['maximum'] = tab
         
         # Add description
         desc = ttk.Label(tab,
@@ -278,11 +461,14 @@ class ModernProductionSchedulerGUI:
                         wraplength=700)
         desc.pack(pady=10)
         
-        # Content will be added later
-        self.create_maximum_content(tab)
+        # Content is built when the tab is first selected
+        self.tab_builders[str(tab)] = lambda: self.create_maximum_content(tab)
 
     def initialize_variables(self):
         """Initialize all variables for input fields with validation"""
+        # Range checks of the validated entries (re-run after a reset)
+        self.field_validators = []
+        
         # Process demands (positive integers)
         self.disp_batches_var = IntVar(value=10)
         self.gran_batches_var = IntVar(value=10)
@@ -331,55 +517,30 @@ class ModernProductionSchedulerGUI:
         
         # Add validation based on type
         if validation_type:
-            def validate(value=None):
-                if value is None:
-                    value = variable.get()
-                
+            pattern, check_range, range_error = _VALIDATORS[validation_type]
+
+            # Per keystroke: a single regex match on the would-be text, so
+            # only characters that can still form a valid value get in
+            vcmd = (parent.register(lambda P: pattern.fullmatch(P) is not None), '%P')
+            entry.configure(validate='key', validatecommand=vcmd)
+
+            # The range check and the ✓/✗ mark only when leaving the field
+            def validate(event=None):
                 try:
-                    if validation_type == 'positive_int':
-                        val = int(value)
-                        if val < 0:
-                            raise ValueError("Value must be positive")
-                        validation_label.configure(text='✓', foreground='green')
-                        return True
-                        
-                    elif validation_type == 'positive_float':
-                        val = float(value)
-                        if val < 0:
-                            raise ValueError("Value cannot be negative")
-                        validation_label.configure(text='✓', foreground='green')
-                        return True
-                        
-                    elif validation_type == 'percentage':
-                        val = float(value)
-                        if val < 0 or val > 100:
-                            raise ValueError("Percentage must be between 0 and 100")
-                        validation_label.configure(text='✓', foreground='green')
-                        return True
-                        
-                    elif validation_type == 'weight':
-                        val = float(value)
-                        if val < 0:
-                            raise ValueError("Weight cannot be negative")
-                        validation_label.configure(text='✓', foreground='green')
-                        return True
-                        
+                    if not check_range(float(entry.get())):
+                        raise ValueError(range_error)
+                    validation_label.configure(text='✓', foreground='green')
+                    return True
                 except ValueError as e:
                     validation_label.configure(text='✗', foreground='red')
                     self.create_tooltip(validation_label, str(e))
                     return False
-            
-            # Register validation
-            vcmd = (parent.register(validate), '%P')
-            entry.configure(validate='key', validatecommand=vcmd)
-            
+
+            entry.bind('<FocusOut>', validate, add='+')
+            self.field_validators.append(validate)
+
             # Also validate initial value
-            validate(variable.get())
-            
-            # Add trace to variable for continuous validation
-            def trace_callback(*args):
-                validate()
-            variable.trace_add('write', trace_callback)
+            validate()
         
         # Add tooltip if provided
         if tooltip:
@@ -409,26 +570,35 @@ class ModernProductionSchedulerGUI:
     def create_tooltip(self, widget, text):
         """Create tooltip for a widget"""
         def show_tooltip(event):
-            tooltip = tk.Toplevel()
-            tooltip.wm_overrideredirect(True)
-            tooltip.wm_geometry(f"+{event.x_root+10}+{event.y_root+10}")
-            
-            label = ttk.Label(tooltip, text=text, background="#ffffe0", 
-                            relief='solid', borderwidth=1)
-            label.pack()
-            
-            def hide_tooltip():
-                tooltip.destroy()
+            self.tooltip_label.configure(text=text)
+            self.tooltip.wm_geometry(f"+{event.x_root+10}+{event.y_root+10}")
+            self.tooltip.deiconify()
+            self.tooltip.lift()
             
-            widget.tooltip = tooltip
-            widget.after(2000, hide_tooltip)
+            # Hide again after 2 s, unless it is left (or re-shown) first
+            if self.tooltip_hide_id is not None:
+                self.root.after_cancel(self.tooltip_hide_id)
+            self.tooltip_hide_id = self.root.after(2000, self.hide_tooltip)
             
-        def hide_tooltip(event):
-            if hasattr(widget, 'tooltip'):
-                widget.tooltip.destroy()
-                
         widget.bind('<Enter>', show_tooltip)
-        widget.bind('<Leave>', hide_tooltip)
+        widget.bind('<Leave>', lambda event: self.hide_tooltip())
+
+    def create_tooltip_window(self):
+        """Create the single tooltip window, kept hidden until a tooltip is shown"""
+        self.tooltip = tk.Toplevel(self.root, name='tooltip')
+        self.tooltip.wm_overrideredirect(True)
+        self.tooltip.withdraw()
+        self.tooltip_label = ttk.Label(self.tooltip, background="#ffffe0", 
+                                       relief='solid', borderwidth=1)
+        self.tooltip_label.pack()
+        self.tooltip_hide_id = None
+
+    def hide_tooltip(self):
+        """Hide the tooltip window"""
+        if self.tooltip_hide_id is not None:
+            self.root.after_cancel(self.tooltip_hide_id)
+            self.tooltip_hide_id = None
+        self.tooltip.withdraw()
 
     def create_individual_content(self, parent):
         """Create content for Individual Processes tab with validation"""
@@ -475,9 +645,6 @@ class ModernProductionSchedulerGUI:
             validation_type='positive_int'
         )
         
-        # Common parameters section
-        self.create_common_parameters(content_frame)
-        
         # Buttons
         button_frame = ttk.Frame(content_frame)
         button_frame.pack(fill='x', pady=10)
@@ -495,6 +662,9 @@ class ModernProductionSchedulerGUI:
             command=self.clear_individual
         )
         clear_button.pack(side='left', padx=5)
+        
+        # The common parameters section goes above the buttons
+        self.common_params_slots[str(parent)] = button_frame
 
     def create_uniform_content(self, parent):
         """Create content for Uniform Production tab"""
@@ -506,7 +676,7 @@ class ModernProductionSchedulerGUI:
         batches_frame.pack(fill='x', pady=10)
         
         # Create entry field for total batches with integer validation
-        total_batches_entry = self.create_input_field(
+        self.create_input_field(
             batches_frame, 
             "Total Batches:", 
             self.total_batches_var, 
@@ -515,21 +685,6 @@ class ModernProductionSchedulerGUI:
             validation_type='positive_int'
         )
         
-        # Add integer validation
-        def validate_integer(P):
-            if P == "": return True
-            try:
-                int(P)
-                return True
-            except ValueError:
-                return False
-        
-        vcmd = (self.root.register(validate_integer), '%P')
-        total_batches_entry.configure(validate='key', validatecommand=vcmd)
-        
-        # Common parameters section
-        self.create_common_parameters(content_frame)
-        
         # Buttons
         button_frame = ttk.Frame(content_frame)
         button_frame.pack(fill='x', pady=10)
@@ -537,6 +692,9 @@ class ModernProductionSchedulerGUI:
                   command=self.calculate_uniform).pack(side='left', padx=5)
         ttk.Button(button_frame, text="Clear", 
                   command=self.clear_uniform).pack(side='left', padx=5)
+        
+        # The common parameters section goes above the buttons
+        self.common_params_slots[str(parent)] = button_frame
 
     def create_maximum_content(self, parent):
         """Create content for Maximum Production tab"""
@@ -553,9 +711,6 @@ class ModernProductionSchedulerGUI:
                               validation_type='positive_int'
         )
         
-        # Common parameters section
-        self.create_common_parameters(content_frame)
-        
         # Buttons
         button_frame = ttk.Frame(content_frame)
         button_frame.pack(fill='x', pady=10)
@@ -563,11 +718,14 @@ class ModernProductionSchedulerGUI:
                   command=self.calculate_maximum).pack(side='left', padx=5)
         ttk.Button(button_frame, text="Clear", 
                   command=self.clear_maximum).pack(side='left', padx=5)
+        
+        # The common parameters section goes above the buttons
+        self.common_params_slots[str(parent)] = button_frame
 
     def create_common_parameters(self, parent):
-        """Create common parameters section with validation"""
+        """Create common parameters section with validation (left unpacked;
+        on_tab_changed places it in the selected tab)"""
         params_frame = ttk.LabelFrame(parent, text="Common Parameters")
-        params_frame.pack(fill='x', pady=10)
         
         # Basic parameters with validation
         self.create_input_field(
@@ -621,6 +779,8 @@ class ModernProductionSchedulerGUI:
             "Cost multiplier for night shifts (non-negative)",
             validation_type='weight'
         )
+        
+        return params_frame
 
     def create_machine_selection(self, parent):
         """Create machine selection section with checkboxes"""
@@ -651,105 +811,103 @@ class ModernProductionSchedulerGUI:
     def calculate_individual(self):
         """Calculate staff requirements for individual processes"""
         try:
-            # Get input values
+            # Get input values (each Tk variable read once, straight into the
+            # optimizer arguments)
             disp_batches = self.disp_batches_var.get()
             gran_batches = self.gran_batches_var.get()
             tab_batches = self.tab_batches_var.get()
             coat_batches = self.coat_batches_var.get()
-            days_limit = self.days_var.get()
-            buffer_ratio = self.buffer_var.get() / 100.0  # Convert percentage to decimal
-            
-            # Get shift weights
-            w_morning = self.morning_weight_var.get()
-            w_evening = self.evening_weight_var.get()
-            w_night = self.night_weight_var.get()
-            
-            # Get machine selections
-            use_p3030 = self.machine_vars['p3030'].get()
-            use_p3090i = self.machine_vars['p3090i'].get()
-            use_ima = self.machine_vars['ima'].get()
-            use_bosch = self.machine_vars['bosch'].get()
-            use_glatt = self.machine_vars['glatt'].get()
-
-            # Get the current tab
-            current_tab = self.notebook.select()
-            current_tab_index = self.notebook.index(current_tab)
-            tab_widget = self.notebook.winfo_children()[current_tab_index]
-
-            # Clear previous results if they exist
-            self.clear_results()
+            common = self.get_optimizer_arguments()
+            machines = self.get_machine_selection()
+
+            tab_widget = self.tabs['individual']
+
+            # Recalculating on the same tab keeps the results panel, whose
+            # tables are refilled in place (see create_results_table)
+            if not self.results_table_shown(tab_widget):
+                # Clear previous results if they exist
+                self.clear_results()
+
+                # Create new results frame with its (empty) tables, then
+                # show it in one go
+                self.results_frame = ttk.LabelFrame(tab_widget, text="Results")
+                self.build_results_table()
+                self.results_frame.pack(fill='x', padx=20, pady=10)
+
+            # Run the four optimizations on the worker pool; they are
+            # independent and the solvers release the GIL, so the wall time is
+            # the slowest one and the window keeps repainting meanwhile
+            futures = {
+                'Dispensing': self.pool.submit(
+                    cached_optimize_dispensing, batches_required=disp_batches, **common),
+                'Granulation': self.pool.submit(
+                    cached_optimize_granulation, batches_required=gran_batches, **common),
+                'Tableting': self.pool.submit(
+                    cached_optimize_tableting, batches_required=tab_batches,
+                    use_p3030=machines['use_p3030'], use_p3090i=machines['use_p3090i'],
+                    use_ima=machines['use_ima'], **common),
+                'Coating': self.pool.submit(
+                    cached_optimize_coating, batches_required=coat_batches,
+                    use_bosch=machines['use_bosch'], use_glatt=machines['use_glatt'], **common),
+            }
 
-            # Create new results frame
-            self.results_frame = ttk.LabelFrame(tab_widget, text="Results")
-            self.results_frame.pack(fill='x', padx=20, pady=10)
+            self.results_frame.configure(text="Results (calculating...)")
+            self.pending_results = futures
+            self.root.after(50, self.collect_individual_results, self.results_frame, futures)
 
-            # Run optimizations for each process
-            results = {}
-            
-            # Dispensing
-            disp_result = optimize_dispensing(
-                batches_required=disp_batches,
-                num_workdays=days_limit,
-                buffer_ratio=buffer_ratio,
-                w_morning=w_morning,
-                w_evening=w_evening,
-                w_night=w_night,
-                print_solution=False
-            )
-            results['Dispensing'] = disp_result
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
-            # Granulation
-            gran_result = optimize_granulation(
-                batches_required=gran_batches,
-                num_workdays=days_limit,
-                buffer_ratio=buffer_ratio,
-                w_morning=w_morning,
-                w_evening=w_evening,
-                w_night=w_night,
-                print_solution=False
-            )
-            results['Granulation'] = gran_result
+    def get_optimizer_arguments(self):
+        """Read the common parameters into keyword arguments shared by all optimizers"""
+        return dict(
+            num_workdays=self.days_var.get(),
+            buffer_ratio=self.buffer_var.get() / 100.0,  # Convert percentage to decimal
+            w_morning=self.morning_weight_var.get(),
+            w_evening=self.evening_weight_var.get(),
+            w_night=self.night_weight_var.get(),
+            print_solution=False
+        )
 
-            # Tableting
-            tab_result = optimize_tableting(
-                batches_required=tab_batches,
-                num_workdays=days_limit,
-                use_p3030=use_p3030,
-                use_p3090i=use_p3090i,
-                use_ima=use_ima,
-                buffer_ratio=buffer_ratio,
-                w_morning=w_morning,
-                w_evening=w_evening,
-                w_night=w_night,
-                print_solution=False
-            )
-            results['Tableting'] = tab_result
+    def get_machine_selection(self):
+        """Snapshot the machine checkboxes as the optimizers' use_* keyword arguments"""
+        return {f'use_{name}': var.get() for name, var in self.machine_vars.items()}
 
-            # Coating
-            coat_result = optimize_coating(
-                batches_required=coat_batches,
-                num_workdays=days_limit,
-                use_bosch=use_bosch,
-                use_glatt=use_glatt,
-                buffer_ratio=buffer_ratio,
-                w_morning=w_morning,
-                w_evening=w_evening,
-                w_night=w_night,
-                print_solution=False
-            )
-            results['Coating'] = coat_result
+    def collect_individual_results(self, results_frame, futures):
+        """Poll the individual-process optimizations and show them once all are done"""
+        # Cleared or recalculated meanwhile: these results are no longer wanted
+        if results_frame is not self.results_frame or futures is not self.pending_results:
+            return
+        if not all(future.done() for future in futures.values()):
+            self.root.after(50, self.collect_individual_results, results_frame, futures)
+            return
 
-            # Display results in a table format
-            self.create_results_table(results)
+        try:
+            results = {process: future.result() for process, future in futures.items()}
 
-            # Update the GUI
-            self.root.update_idletasks()
+            results_frame.configure(text="Results")
+            if not self.results_unchanged(self.tabs['individual'], results):
+                self.create_results_table(results)
 
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
-    def create_results_table(self, results):
-        """Create a table to display optimization results"""
+    def results_unchanged(self, tab_widget, results):
+        """Whether the results panel on tab_widget already shows exactly these results"""
+        return (self.shown_results is not None
+                and self.shown_results[0] is self.results_frame
+                and self.results_frame.master is tab_widget
+                and self.shown_results[1] == results)
+
+    def results_table_shown(self, tab_widget):
+        """Whether the individual-process results panel is showing on tab_widget"""
+        return (self.results_table is not None
+                and self.results_table['frame'] is self.results_frame
+                and self.results_frame.winfo_exists()
+                and self.results_frame.master is tab_widget)
+
+    def build_results_table(self):
+        """Create the (empty) results panel of the individual processes"""
         # Create a container frame for results
         results_container = ttk.Frame(self.results_frame)
         results_container.pack(fill='both', expand=True, padx=5, pady=5)
@@ -767,40 +925,8 @@ class ModernProductionSchedulerGUI:
         table_frame.pack(side='left', fill='both', expand=True)
         
         # Create summary Treeview
-        columns = ('Process', 'Staff Required', 'With Buffer', 'Days Used', 'Batches Produced', 'Status')
-        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=5)
-        
-        # Configure columns
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=120, anchor='center')
-        
-        # Add data
-        total_staff = 0
-        total_staff_with_buffer = 0
-        
-        for process, result in results.items():
-            if result is None:
-                tree.insert('', 'end', values=(
-                    process, 'N/A', 'N/A', 'N/A', 'N/A', 'Infeasible'
-                ))
-            else:
-                # Get batches produced (handle different key names)
-                if process == 'Coating':
-                    batches = result['final_batches_count']
-                else:
-                    batches = result['total_batches_produced']
-
-                tree.insert('', 'end', values=(
-                    process,
-                    result['min_staff_required'],
-                    result['staff_with_buffer'],
-                    result['days_used'],
-                    batches,
-                    'Optimal'
-                ))
-                total_staff += result['min_staff_required']
-                total_staff_with_buffer += result['staff_with_buffer']
+        tree = ttk.Treeview(table_frame, show='headings', height=5)
+        self.configure_columns(tree, SUMMARY_COLUMNS)
         
         # Add scrollbar to summary table
         scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
@@ -812,126 +938,24 @@ class ModernProductionSchedulerGUI:
         cards_frame = ttk.Frame(summary_tab)
         cards_frame.pack(side='right', fill='y', padx=20)
         
-        # Style for cards
-        style = ttk.Style()
-        style.configure('Card.TFrame', background=self.colors['bg'])
-        style.configure('CardTitle.TLabel',
-                       font=('Helvetica', 14, 'bold'),
-                       foreground=self.colors['primary'],
-                       background=self.colors['bg'])
-        style.configure('CardValue.TLabel',
-                       font=('Helvetica', 24, 'bold'),
-                       foreground=self.colors['secondary'],
-                       background=self.colors['bg'])
-        
         # Cards for key metrics - removed Total Days Used as requested
-        metrics = [
-            ("Minimum Staff Required", total_staff),
-            ("Staff with Buffer", total_staff_with_buffer)
-        ]
-        
-        for title, value in metrics:
+        cards = []
+        for title in ("Minimum Staff Required", "Staff with Buffer"):
             card = ttk.Frame(cards_frame, style='Card.TFrame', relief='solid')
             card.pack(fill='x', pady=10, ipady=10)
             
             ttk.Label(card, text=title, style='CardTitle.TLabel').pack(pady=(5, 0))
-            ttk.Label(card, text=str(value), style='CardValue.TLabel').pack(pady=5)
+            value_label = ttk.Label(card, style='CardValue.TLabel')
+            value_label.pack(pady=5)
+            cards.append(value_label)
         
         # Detailed Results Tab
         detailed_tab = ttk.Frame(results_notebook)
         results_notebook.add(detailed_tab, text='Detailed Results')
         
         # Create detailed results table
-        # Set a fixed row height for the treeview to accommodate multiline content
-        style.configure("Multiline.Treeview", rowheight=60)  # Increased row height
         detailed_tree = ttk.Treeview(detailed_tab, show='headings', style="Multiline.Treeview", height=5)
-        detailed_cols = ('Process', 'Morning Shifts', 'Evening Shifts', 'Night Shifts', 'Machine Details')
-        detailed_tree['columns'] = detailed_cols
-        
-        for col in detailed_cols:
-            detailed_tree.heading(col, text=col)
-            if col == 'Machine Details':
-                detailed_tree.column(col, width=150, anchor='w')  # Left align for better readability
-            else:
-                detailed_tree.column(col, width=120, anchor='center')
-        
-        # Add detailed data
-        for process, result in results.items():
-            if result and result.get('solver_status') == 'Optimal':
-                # Get shift data based on process type
-                if process in ['Dispensing', 'Granulation']:
-                    # Direct access for Dispensing and Granulation
-                    morning = result.get('morning_shifts', 0)
-                    evening = result.get('evening_shifts', 0)
-                    night = result.get('night_shifts', 0)
-                    machine_details = "N/A"  # No machine details for these processes
-                elif process == 'Tableting':
-                    # For Tableting: Count shifts per machine
-                    morning_shifts = result.get('morning_shifts', {})
-                    evening_shifts = result.get('evening_shifts', {})
-                    night_shifts = result.get('night_shifts', {})
-                    
-                    # Initialize total counts
-                    if isinstance(morning_shifts, dict):
-                        # Sum shifts per time period
-                        morning = sum(morning_shifts.values())
-                        evening = sum(evening_shifts.values())
-                        night = sum(night_shifts.values())
-                        
-                        # Count total shifts per machine
-                        machine_counts = {}
-                        for machine in ['P3030', 'P3090i', 'IMA']:
-                            if machine in morning_shifts:
-                                machine_counts[machine] = morning_shifts.get(machine, 0) + evening_shifts.get(machine, 0) + night_shifts.get(machine, 0)
-                        
-                        # Format the machine details string with newlines
-                        machine_details_parts = []
-                        for machine, count in machine_counts.items():
-                            if count > 0:
-                                machine_details_parts.append(f"{machine}: {count}")
-                        machine_details = "\n".join(machine_details_parts)
-                    else:
-                        morning = morning_shifts
-                        evening = evening_shifts
-                        night = night_shifts
-                        machine_details = "N/A"
-                elif process == 'Coating':
-                    # For Coating: Count shifts per machine
-                    morning_shifts = result.get('morning_shifts', {})
-                    evening_shifts = result.get('evening_shifts', {})
-                    night_shifts = result.get('night_shifts', {})
-                    
-                    if isinstance(morning_shifts, dict):
-                        # Sum shifts per time period
-                        morning = sum(morning_shifts.values())
-                        evening = sum(evening_shifts.values())
-                        night = sum(night_shifts.values())
-                        
-                        # Count total shifts per machine
-                        machine_counts = {}
-                        for machine in ['Solution', 'BOSCH', 'GLATT']:
-                            if machine in morning_shifts:
-                                machine_counts[machine] = morning_shifts.get(machine, 0) + evening_shifts.get(machine, 0) + night_shifts.get(machine, 0)
-                        
-                        # Format the machine details string with newlines
-                        machine_details_parts = []
-                        for machine, count in machine_counts.items():
-                            if count > 0:
-                                machine_details_parts.append(f"{machine}: {count}")
-                        machine_details = "\n".join(machine_details_parts)
-                    else:
-                        morning = morning_shifts
-                        evening = evening_shifts
-                        night = night_shifts
-                        machine_details = "N/A"
-                
-                detailed_tree.insert('', 'end', values=(
-                    process,
-                    morning,
-                    evening,
-                    night,
-                    machine_details
-                ))
+        self.configure_columns(detailed_tree, DETAILED_COLUMNS)
         
         # Add scrollbar to detailed table
         detailed_scrollbar = ttk.Scrollbar(detailed_tab, orient='vertical', command=detailed_tree.yview)
@@ -945,65 +969,133 @@ class ModernProductionSchedulerGUI:
         
         # Create shift distribution table
         shift_tree = ttk.Treeview(shift_tab, show='headings', height=10)
-        shift_cols = ('Process', 'Total Shifts', 'Morning %', 'Evening %', 'Night %')
-        shift_tree['columns'] = shift_cols
-        
-        for col in shift_cols:
-            shift_tree.heading(col, text=col)
-            shift_tree.column(col, width=120, anchor='center')
-        
-        # Add shift distribution data
-        for process, result in results.items():
-            if result and result.get('solver_status') == 'Optimal':
-                # Get shift data based on process type
-                if process in ['Dispensing', 'Granulation']:
-                    # Direct access for Dispensing and Granulation
-                    morning = result.get('morning_shifts', 0)
-                    evening = result.get('evening_shifts', 0)
-                    night = result.get('night_shifts', 0)
-                elif process == 'Tableting':
-                    # Sum the machines for Tableting
-                    morning_shifts = result.get('morning_shifts', {})
-                    evening_shifts = result.get('evening_shifts', {})
-                    night_shifts = result.get('night_shifts', {})
-                    
-                    if isinstance(morning_shifts, dict):
-                        morning = sum(morning_shifts.values())
-                        evening = sum(evening_shifts.values())
-                        night = sum(night_shifts.values())
-                    else:
-                        morning = morning_shifts
-                        evening = evening_shifts
-                        night = night_shifts
-                elif process == 'Coating':
-                    # Sum the machines for Coating
-                    morning_shifts = result.get('morning_shifts', {})
-                    evening_shifts = result.get('evening_shifts', {})
-                    night_shifts = result.get('night_shifts', {})
-                    
-                    if isinstance(morning_shifts, dict):
-                        morning = sum(morning_shifts.values())
-                        evening = sum(evening_shifts.values())
-                        night = sum(night_shifts.values())
-                    else:
-                        morning = morning_shifts
-                        evening = evening_shifts
-                        night = night_shifts
-                
-                total = morning + evening + night
-                
-                if total > 0:
-                    morning_pct = f"{(morning/total)*100:.1f}%"
-                    evening_pct = f"{(evening/total)*100:.1f}%"
-                    night_pct = f"{(night/total)*100:.1f}%"
-                    
-                    shift_tree.insert('', 'end', values=(
-                        process,
-                        total,
-                        morning_pct,
-                        evening_pct,
-                        night_pct
-                    ))
+        self.configure_columns(shift_tree, SHIFT_COLUMNS)
+        
+        # Add scrollbar to shift distribution table
+        shift_scrollbar = ttk.Scrollbar(shift_tab, orient='vertical', command=shift_tree.yview)
+        shift_tree.configure(yscrollcommand=shift_scrollbar.set)
+        shift_tree.pack(side='left', fill='both', expand=True, padx=5, pady=5)
+        shift_scrollbar.pack(side='right', fill='y')
+        
+        self.results_table = {
+            'frame': self.results_frame,
+            'tree': tree,
+            'cards': cards,
+            'detailed_tree': detailed_tree,
+            'shift_tree': shift_tree,
+        }
+
+    def configure_columns(self, tree, columns):
+        """Set up a Treeview's columns from a (heading, width, anchor) table"""
+        tree['columns'] = tuple(name for name, _, _ in columns)
+        heading, column = tree.heading, tree.column
+        for name, width, anchor in columns:
+            heading(name, text=name)
+            column(name, width=width, anchor=anchor)
+
+    def insert_rows(self, tree, rows):
+        """Append prepared value tuples to a Treeview in one loop"""
+        insert = tree.insert
+        for values in rows:
+            insert('', 'end', values=values)
+
+    def fit_detail_rows(self, rows):
+        """Make the detailed table's rows just tall enough for the most Machine Details lines"""
+        lines = 1 + max((row[-1].count("\n") for row in rows), default=0)
+        ttk.Style().configure("Multiline.Treeview", rowheight=DETAIL_LINE_HEIGHT * lines)
+
+    def add_lazy_tabs(self, notebook, tabs):
+        """
+        Add tabs to a notebook whose content is only built the first
+        time each of them is selected.
+
+        :param tabs: (text, build) pairs; build(tab_frame) fills in the tab
+        """
+        pending = {}
+        for text, build in tabs:
+            tab = ttk.Frame(notebook)
+            notebook.add(tab, text=text)
+            pending[str(tab)] = (tab, build)
+
+        def build_selected(event=None):
+            tab, build = pending.pop(notebook.select(), (None, None))
+            if build is not None:
+                build(tab)
+
+        notebook.bind('<<NotebookTabChanged>>', build_selected, add='+')
+
+    def fill_detailed_tab(self, detailed_tab, detailed_rows):
+        """Build the Detailed Results table of a uniform/maximum results panel"""
+        detailed_tree = ttk.Treeview(detailed_tab, show='headings', style="Multiline.Treeview", height=5)
+        self.configure_columns(detailed_tree, DETAILED_COLUMNS)
+        self.fit_detail_rows(detailed_rows)
+        self.insert_rows(detailed_tree, detailed_rows)
+        
+        # Add scrollbar to detailed table
+        detailed_scrollbar = ttk.Scrollbar(detailed_tab, orient='vertical', command=detailed_tree.yview)
+        detailed_tree.configure(yscrollcommand=detailed_scrollbar.set)
+        detailed_tree.pack(side='left', fill='both', expand=True, padx=5, pady=5)
+        detailed_scrollbar.pack(side='right', fill='y')
+
+    def fill_shift_tab(self, shift_tab, shift_rows):
+        """Build the Shift Distribution table of a uniform/maximum results panel"""
+        shift_tree = ttk.Treeview(shift_tab, show='headings', height=10)
+        self.configure_columns(shift_tree, SHIFT_COLUMNS)
+        self.insert_rows(shift_tree, shift_rows)
+        
+        # Add scrollbar to shift distribution table
+        shift_scrollbar = ttk.Scrollbar(shift_tab, orient='vertical', command=shift_tree.yview)
+        shift_tree.configure(yscrollcommand=shift_scrollbar.set)
+        shift_tree.pack(side='left', fill='both', expand=True, padx=5, pady=5)
+        shift_scrollbar.pack(side='right', fill='y')
+
+    def create_results_table(self, results):
+        """Create a table to display optimization results"""
+        # Build the panel on first use; afterwards only its contents change
+        if self.results_table is None or self.results_table['frame'] is not self.results_frame:
+            self.build_results_table()
+        tree = self.results_table['tree']
+        detailed_tree = self.results_table['detailed_tree']
+        shift_tree = self.results_table['shift_tree']
+        for table in (tree, detailed_tree, shift_tree):
+            table.delete(*table.get_children())
+        
+        # Add data: prepare all rows first, then insert them in one go
+        rows = [
+            (process, 'N/A', 'N/A', 'N/A', 'N/A', 'Infeasible') if result is None else (
+                process,
+                result['min_staff_required'],
+                result['staff_with_buffer'],
+                result['days_used'],
+                # Get batches produced (handle different key names)
+                result['final_batches_count'] if process == 'Coating' else result['total_batches_produced'],
+                'Optimal'
+            )
+            for process, result in results.items()
+        ]
+        self.insert_rows(tree, rows)
+        totals = _summary_totals(rows)
+        self.summary_totals = (self.results_frame, totals)
+        
+        for value_label, value in zip(self.results_table['cards'], (totals['staff_required'], totals['staff_with_buffer'])):
+            value_label.configure(text=str(value))
+        
+        # Add detailed and shift distribution data
+        detailed_rows, shift_rows = _detail_and_shift_rows(results.items())
+        self.fit_detail_rows(detailed_rows)
+        self.insert_rows(detailed_tree, detailed_rows)
+        
+        # Add scrollbar to detailed table
+        detailed_scrollbar = ttk.Scrollbar(detailed_tab, orient='vertical', command=detailed_tree.yview)
+        detailed_tree.configure(yscrollcommand=detailed_scrollbar.set)
+        detailed_tree.pack(side='left', fill='both', expand=True, padx=5, pady=5)
+        detailed_scrollbar.pack(side='right', fill='y')
+
+    def fill_shift_tab(self, shift_tab, shift_rows):
+        """Build the Shift Distribution table of a uniform/maximum results panel"""
+        shift_tree = ttk.Treeview(shift_tab, show='headings', height=10)
+        self.configure_columns(shift_tree, SHIFT_COLUMNS)
+        self.insert_rows(shift_tree, shift_rows)
         
         # Add scrollbar to shift distribution table
         shift_scrollbar = ttk.Scrollbar(shift_tab, orient='vertical', command=shift_tree.yview)
@@ -1011,6 +1103,81 @@ class ModernProductionSchedulerGUI:
         shift_tree.pack(side='left', fill='both', expand=True, padx=5, pady=5)
         shift_scrollbar.pack(side='right', fill='y')
 
+    def create_results_table(self, results):
+        """Create a table to display optimization results"""
+        # Build the panel on first use; afterwards only its contents change
+        if self.results_table is None or self.results_table['frame'] is not self.results_frame:
+            self.build_results_table()
+        tree = self.results_table['tree']
+        detailed_tree = self.results_table['detailed_tree']
+        shift_tree = self.results_table['shift_tree']
+        for table in (tree, detailed_tree, shift_tree):
+            table.delete(*table.get_children())
+        
+        # Add data: prepare all rows first, then insert them in one go
+        rows = [
+            (process, 'N/A', 'N/A', 'N/A', 'N/A', 'Infeasible') if result is None else (
+                process,
+                result['min_staff_required'],
+                result['staff_with_buffer'],
+                result['days_used'],
+                # Get batches produced (handle different key names)
+                result['final_batches_count'] if process == 'Coating' else result['total_batches_produced'],
+                'Optimal'
+            )
+            for process, result in results.items()
+        ]
+        self.insert_rows(tree, rows)
+        totals = _summary_totals(rows)
+        self.summary_totals = (self.results_frame, totals)
+        
+        for value_label, value in zip(self.results_table['cards'], (totals['staff_required'], totals['staff_with_buffer'])):
+            value_label.configure(text=str(value))
+        
+        # Add detailed and shift distribution data, both rows of a process from one pass
+        detailed_rows = []
+        shift_rows = []
+        # Solved processes only, filtered once
+        optimal = [
+            (process, result) for process, result in results.items()
+            if result and result.get('solver_status') == 'Optimal'
+        ]
+        for process, result in optimal:
+            morning, evening, night, machine_counts = _process_shifts(process, result)
+            
+            if machine_counts is not None:
+                # Format the machine details string with newlines
+                machine_details = "\n".join(
+                    f"{machine}: {count}" for machine, count in machine_counts.items() if count > 0
+                )
+            else:
+                machine_details = "N/A"  # No machine details for these processes
+            
+            detailed_rows.append((
+                process,
+                morning,
+                evening,
+                night,
+                machine_details
+            ))
+            
+            total = morning + evening + night
+            if total > 0:
+                # One scale factor for the three shares
+                scale = 100.0 / total
+                shift_rows.append((
+                    process,
+                    total,
+                    f"{morning * scale:.1f}%",
+                    f"{evening * scale:.1f}%",
+                    f"{night * scale:.1f}%"
+                ))
+        self.fit_detail_rows(detailed_rows)
+        self.insert_rows(detailed_tree, detailed_rows)
+        self.insert_rows(shift_tree, shift_rows)
+        
+        self.shown_results = (self.results_frame, results)
+
     def calculate_uniform(self):
         """Calculate staff requirements for uniform production"""
         try:
@@ -1025,23 +1192,9 @@ class ModernProductionSchedulerGUI:
             w_night = self.night_weight_var.get()
             
             # Get machine selections
-            use_p3030 = self.machine_vars['p3030'].get()
-            use_p3090i = self.machine_vars['p3090i'].get()
-            use_ima = self.machine_vars['ima'].get()
-            use_bosch = self.machine_vars['bosch'].get()
-            use_glatt = self.machine_vars['glatt'].get()
-
-            # Get the current tab
-            current_tab = self.notebook.select()
-            current_tab_index = self.notebook.index(current_tab)
-            tab_widget = self.notebook.winfo_children()[current_tab_index]
-
-            # Clear previous results if they exist
-            self.clear_results()
+            machines = self.get_machine_selection()
 
-            # Create new results frame
-            self.results_frame = ttk.LabelFrame(tab_widget, text="Results")
-            self.results_frame.pack(fill='x', padx=20, pady=10)
+            tab_widget = self.tabs['uniform']
 
             # Run optimization for uniform production
             result = optimize_osd_schedule_with_total(
@@ -1051,14 +1204,20 @@ class ModernProductionSchedulerGUI:
                 w_morning=w_morning,
                 w_evening=w_evening,
                 w_night=w_night,
-                use_p3030=use_p3030,
-                use_p3090i=use_p3090i,
-                use_ima=use_ima,
-                use_bosch=use_bosch,
-                use_glatt=use_glatt,
+                **machines,
                 print_combined=False
             )
 
+            # Same results already on this tab: keep the panel as it is
+            if result is not None and self.results_unchanged(tab_widget, result):
+                return
+
+            # Clear previous results if they exist
+            self.clear_results()
+
+            # Create new results frame (packed once it is filled in)
+            self.results_frame = ttk.LabelFrame(tab_widget, text="Results")
+
             if result is None:
                 messagebox.showerror("Error", "No feasible solution found. Try increasing the number of days or reducing the batch demand.")
                 return
@@ -1079,31 +1238,24 @@ class ModernProductionSchedulerGUI:
             table_frame.pack(side='left', fill='both', expand=True)
             
             # Create summary Treeview
-            columns = ('Process', 'Staff Required', 'With Buffer', 'Days Used', 'Batches Produced', 'Status')
-            tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=5)
-            
-            # Configure columns
-            for col in columns:
-                tree.heading(col, text=col)
-                tree.column(col, width=120, anchor='center')
+            tree = ttk.Treeview(table_frame, show='headings', height=5)
+            self.configure_columns(tree, SUMMARY_COLUMNS)
             
             # Add data for each process
             processes = ['dispensing', 'granulation', 'tableting', 'coating']
-            for process in processes:
-                process_result = result[process]
-                if process == 'coating':
-                    batches = process_result['final_batches_count']
-                else:
-                    batches = process_result['total_batches_produced']
-                
-                tree.insert('', 'end', values=(
+            rows = [
+                (
                     process.capitalize(),
-                    process_result['min_staff_required'],
-                    process_result['staff_with_buffer'],
-                    process_result['days_used'],
-                    batches,
+                    result[process]['min_staff_required'],
+                    result[process]['staff_with_buffer'],
+                    result[process]['days_used'],
+                    result[process]['final_batches_count' if process == 'coating' else 'total_batches_produced'],
                     'Optimal'
-                ))
+                )
+                for process in processes
+            ]
+            self.insert_rows(tree, rows)
+            self.summary_totals = (self.results_frame, _summary_totals(rows))
             
             # Add scrollbar to summary table
             scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
@@ -1115,18 +1267,6 @@ class ModernProductionSchedulerGUI:
             cards_frame = ttk.Frame(summary_tab)
             cards_frame.pack(side='right', fill='y', padx=20)
             
-            # Style for cards
-            style = ttk.Style()
-            style.configure('Card.TFrame', background=self.colors['bg'])
-            style.configure('CardTitle.TLabel',
-                           font=('Helvetica', 14, 'bold'),
-                           foreground=self.colors['primary'],
-                           background=self.colors['bg'])
-            style.configure('CardValue.TLabel',
-                           font=('Helvetica', 24, 'bold'),
-                           foreground=self.colors['secondary'],
-                           background=self.colors['bg'])
-            
             # Cards for key metrics
             metrics = [
                 ("Total Staff Required", result['total_min_staff_summed']),
@@ -1141,136 +1281,20 @@ class ModernProductionSchedulerGUI:
                 ttk.Label(card, text=title, style='CardTitle.TLabel').pack(pady=(5, 0))
                 ttk.Label(card, text=str(value), style='CardValue.TLabel').pack(pady=5)
             
-            # Detailed Results Tab
-            detailed_tab = ttk.Frame(results_notebook)
-            results_notebook.add(detailed_tab, text='Detailed Results')
-            
-            # Create detailed results table
-            # Set a fixed row height for the treeview to accommodate multiline content
-            style.configure("Multiline.Treeview", rowheight=60)  # Increased row height
-            detailed_tree = ttk.Treeview(detailed_tab, show='headings', style="Multiline.Treeview", height=5)
-            detailed_cols = ('Process', 'Morning Shifts', 'Evening Shifts', 'Night Shifts', 'Machine Details')
-            detailed_tree['columns'] = detailed_cols
-            
-            for col in detailed_cols:
-                detailed_tree.heading(col, text=col)
-                if col == 'Machine Details':
-                    detailed_tree.column(col, width=150, anchor='w')  # Left align for better readability
-                else:
-                    detailed_tree.column(col, width=120, anchor='center')
-            
-            # Add detailed data
-            for process in processes:
-                process_result = result[process]
-                if process_result and process_result.get('solver_status') == 'Optimal':
-                    # Get shift data based on process type
-                    if process in ['dispensing', 'granulation']:
-                        morning = process_result.get('morning_shifts', 0)
-                        evening = process_result.get('evening_shifts', 0)
-                        night = process_result.get('night_shifts', 0)
-                        machine_details = "N/A"
-                    else:
-                        morning_shifts = process_result.get('morning_shifts', {})
-                        evening_shifts = process_result.get('evening_shifts', {})
-                        night_shifts = process_result.get('night_shifts', {})
-                        
-                        if isinstance(morning_shifts, dict):
-                            morning = sum(morning_shifts.values())
-                            evening = sum(evening_shifts.values())
-                            night = sum(night_shifts.values())
-                            
-                            # Count total shifts per machine
-                            machine_counts = {}
-                            machines = ['P3030', 'P3090i', 'IMA'] if process == 'tableting' else ['Solution', 'BOSCH', 'GLATT']
-                            for machine in machines:
-                                if machine in morning_shifts:
-                                    machine_counts[machine] = morning_shifts.get(machine, 0) + evening_shifts.get(machine, 0) + night_shifts.get(machine, 0)
-                            
-                            # Format machine details string with newlines
-                            machine_details = ""
-                            for machine, count in machine_counts.items():
-                                if count > 0:
-                                    if machine_details:
-                                        machine_details += "\n"
-                                    machine_details += f"{machine}: {count}"
-                        else:
-                            morning = morning_shifts
-                            evening = evening_shifts
-                            night = night_shifts
-                            machine_details = "N/A"
-                    
-                    detailed_tree.insert('', 'end', values=(
-                        process.capitalize(),
-                        morning,
-                        evening,
-                        night,
-                        machine_details
-                    ))
-            
-            # Add scrollbar to detailed table
-            detailed_scrollbar = ttk.Scrollbar(detailed_tab, orient='vertical', command=detailed_tree.yview)
-            detailed_tree.configure(yscrollcommand=detailed_scrollbar.set)
-            detailed_tree.pack(side='left', fill='both', expand=True, padx=5, pady=5)
-            detailed_scrollbar.pack(side='right', fill='y')
-            
-            # Shift Distribution Tab
-            shift_tab = ttk.Frame(results_notebook)
-            results_notebook.add(shift_tab, text='Shift Distribution')
-            
-            # Create shift distribution table
-            shift_tree = ttk.Treeview(shift_tab, show='headings', height=10)
-            shift_cols = ('Process', 'Total Shifts', 'Morning %', 'Evening %', 'Night %')
-            shift_tree['columns'] = shift_cols
-            
-            for col in shift_cols:
-                shift_tree.heading(col, text=col)
-                shift_tree.column(col, width=120, anchor='center')
-            
-            # Add shift distribution data
-            for process in processes:
-                process_result = result[process]
-                if process_result and process_result.get('solver_status') == 'Optimal':
-                    if process in ['dispensing', 'granulation']:
-                        morning = process_result.get('morning_shifts', 0)
-                        evening = process_result.get('evening_shifts', 0)
-                        night = process_result.get('night_shifts', 0)
-                    else:
-                        morning_shifts = process_result.get('morning_shifts', {})
-                        evening_shifts = process_result.get('evening_shifts', {})
-                        night_shifts = process_result.get('night_shifts', {})
-                        
-                        if isinstance(morning_shifts, dict):
-                            morning = sum(morning_shifts.values())
-                            evening = sum(evening_shifts.values())
-                            night = sum(night_shifts.values())
-                        else:
-                            morning = morning_shifts
-                            evening = evening_shifts
-                            night = night_shifts
-                    
-                    total = morning + evening + night
-                    
-                    if total > 0:
-                        morning_pct = f"{(morning/total)*100:.1f}%"
-                        evening_pct = f"{(evening/total)*100:.1f}%"
-                        night_pct = f"{(night/total)*100:.1f}%"
-                        
-                        shift_tree.insert('', 'end', values=(
-                            process.capitalize(),
-                            total,
-                            morning_pct,
-                            evening_pct,
-                            night_pct
-                        ))
+            # Detailed and shift distribution rows
+            detailed_rows, shift_rows = _detail_and_shift_rows(
+                (process.capitalize(), result[process]) for process in processes
+            )
             
-            # Add scrollbar to shift distribution table
-            shift_scrollbar = ttk.Scrollbar(shift_tab, orient='vertical', command=shift_tree.yview)
-            shift_tree.configure(yscrollcommand=shift_scrollbar.set)
-            shift_tree.pack(side='left', fill='both', expand=True, padx=5, pady=5)
-            shift_scrollbar.pack(side='right', fill='y')
+            # Their tables are only built once the user opens the tab
+            self.add_lazy_tabs(results_notebook, [
+                ('Detailed Results', lambda tab: self.fill_detailed_tab(tab, detailed_rows)),
+                ('Shift Distribution', lambda tab: self.fill_shift_tab(tab, shift_rows)),
+            ])
 
-            # Update the GUI
-            self.root.update_idletasks()
+            # Show the finished panel: Tk lays it out and draws it in one go
+            self.results_frame.pack(fill='x', padx=20, pady=10)
+            self.shown_results = (self.results_frame, result)
 
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
@@ -1289,23 +1313,9 @@ class ModernProductionSchedulerGUI:
             w_night = self.night_weight_var.get()
             
             # Get machine selections
-            use_p3030 = self.machine_vars['p3030'].get()
-            use_p3090i = self.machine_vars['p3090i'].get()
-            use_ima = self.machine_vars['ima'].get()
-            use_bosch = self.machine_vars['bosch'].get()
-            use_glatt = self.machine_vars['glatt'].get()
+            machines = self.get_machine_selection()
 
-            # Get the current tab
-            current_tab = self.notebook.select()
-            current_tab_index = self.notebook.index(current_tab)
-            tab_widget = self.notebook.winfo_children()[current_tab_index]
-
-            # Clear previous results if they exist
-            self.clear_results()
-
-            # Create new results frame
-            self.results_frame = ttk.LabelFrame(tab_widget, text="Results")
-            self.results_frame.pack(fill='x', padx=20, pady=10)
+            tab_widget = self.tabs['maximum']
 
             # Run optimization for maximum production
             result = optimize_max_batches(
@@ -1314,14 +1324,20 @@ class ModernProductionSchedulerGUI:
                 w_morning=w_morning,
                 w_evening=w_evening,
                 w_night=w_night,
-                use_p3030=use_p3030,
-                use_p3090i=use_p3090i,
-                use_ima=use_ima,
-                use_bosch=use_bosch,
-                use_glatt=use_glatt,
+                **machines,
                 print_solution=False
             )
 
+            # Same results already on this tab: keep the panel as it is
+            if result is not None and self.results_unchanged(tab_widget, result):
+                return
+
+            # Clear previous results if they exist
+            self.clear_results()
+
+            # Create new results frame (packed once it is filled in)
+            self.results_frame = ttk.LabelFrame(tab_widget, text="Results")
+
             if result is None:
                 messagebox.showerror("Error", "No feasible solution found. Try adjusting machine selection or increasing the days limit.")
                 return
@@ -1342,31 +1358,24 @@ class ModernProductionSchedulerGUI:
             table_frame.pack(side='left', fill='both', expand=True)
             
             # Create summary Treeview
-            columns = ('Process', 'Staff Required', 'With Buffer', 'Days Used', 'Batches Produced', 'Status')
-            tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=5)
-            
-            # Configure columns
-            for col in columns:
-                tree.heading(col, text=col)
-                tree.column(col, width=120, anchor='center')
+            tree = ttk.Treeview(table_frame, show='headings', height=5)
+            self.configure_columns(tree, SUMMARY_COLUMNS)
             
             # Add data for each process
             processes = ['dispensing', 'granulation', 'tableting', 'coating']
-            for process in processes:
-                process_result = result[process]
-                if process == 'coating':
-                    batches = process_result['final_batches_count']
-                else:
-                    batches = process_result['total_batches_produced']
-                
-                tree.insert('', 'end', values=(
+            rows = [
+                (
                     process.capitalize(),
-                    process_result['min_staff_required'],
-                    process_result['staff_with_buffer'],
-                    process_result['days_used'],
-                    batches,
+                    result[process]['min_staff_required'],
+                    result[process]['staff_with_buffer'],
+                    result[process]['days_used'],
+                    result[process]['final_batches_count' if process == 'coating' else 'total_batches_produced'],
                     'Optimal'
-                ))
+                )
+                for process in processes
+            ]
+            self.insert_rows(tree, rows)
+            self.summary_totals = (self.results_frame, _summary_totals(rows))
             
             # Add scrollbar to summary table
             scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
@@ -1378,18 +1387,6 @@ class ModernProductionSchedulerGUI:
             cards_frame = ttk.Frame(summary_tab)
             cards_frame.pack(side='right', fill='y', padx=20)
             
-            # Style for cards
-            style = ttk.Style()
-            style.configure('Card.TFrame', background=self.colors['bg'])
-            style.configure('CardTitle.TLabel',
-                        font=('Helvetica', 14, 'bold'),
-                        foreground=self.colors['primary'],
-                        background=self.colors['bg'])
-            style.configure('CardValue.TLabel',
-                        font=('Helvetica', 24, 'bold'),
-                        foreground=self.colors['secondary'],
-                        background=self.colors['bg'])
-            
             # Cards for key metrics
             metrics = [
                 ("Maximum Batches", result['max_feasible_batches']),
@@ -1404,136 +1401,20 @@ class ModernProductionSchedulerGUI:
                 ttk.Label(card, text=title, style='CardTitle.TLabel').pack(pady=(5, 0))
                 ttk.Label(card, text=str(value), style='CardValue.TLabel').pack(pady=5)
             
-            # Detailed Results Tab
-            detailed_tab = ttk.Frame(results_notebook)
-            results_notebook.add(detailed_tab, text='Detailed Results')
-            
-            # Create detailed results table
-            # Set a fixed row height for the treeview to accommodate multiline content
-            style.configure("Multiline.Treeview", rowheight=60)  # Increased row height
-            detailed_tree = ttk.Treeview(detailed_tab, show='headings', style="Multiline.Treeview", height=5)
-            detailed_cols = ('Process', 'Morning Shifts', 'Evening Shifts', 'Night Shifts', 'Machine Details')
-            detailed_tree['columns'] = detailed_cols
-            
-            for col in detailed_cols:
-                detailed_tree.heading(col, text=col)
-                if col == 'Machine Details':
-                    detailed_tree.column(col, width=150, anchor='w')  # Left align for better readability
-                else:
-                    detailed_tree.column(col, width=120, anchor='center')
-            
-            # Add detailed data
-            for process in processes:
-                process_result = result[process]
-                if process_result and process_result.get('solver_status') == 'Optimal':
-                    # Get shift data based on process type
-                    if process in ['dispensing', 'granulation']:
-                        morning = process_result.get('morning_shifts', 0)
-                        evening = process_result.get('evening_shifts', 0)
-                        night = process_result.get('night_shifts', 0)
-                        machine_details = "N/A"
-                    else:
-                        morning_shifts = process_result.get('morning_shifts', {})
-                        evening_shifts = process_result.get('evening_shifts', {})
-                        night_shifts = process_result.get('night_shifts', {})
-                        
-                        if isinstance(morning_shifts, dict):
-                            morning = sum(morning_shifts.values())
-                            evening = sum(evening_shifts.values())
-                            night = sum(night_shifts.values())
-                            
-                            # Count total shifts per machine
-                            machine_counts = {}
-                            machines = ['P3030', 'P3090i', 'IMA'] if process == 'tableting' else ['Solution', 'BOSCH', 'GLATT']
-                            for machine in machines:
-                                if machine in morning_shifts:
-                                    machine_counts[machine] = morning_shifts.get(machine, 0) + evening_shifts.get(machine, 0) + night_shifts.get(machine, 0)
-                            
-                            # Format machine details string with newlines
-                            machine_details = ""
-                            for machine, count in machine_counts.items():
-                                if count > 0:
-                                    if machine_details:
-                                        machine_details += "\n"
-                                    machine_details += f"{machine}: {count}"
-                        else:
-                            morning = morning_shifts
-                            evening = evening_shifts
-                            night = night_shifts
-                            machine_details = "N/A"
-                    
-                    detailed_tree.insert('', 'end', values=(
-                        process.capitalize(),
-                        morning,
-                        evening,
-                        night,
-                        machine_details
-                    ))
-            
-            # Add scrollbar to detailed table
-            detailed_scrollbar = ttk.Scrollbar(detailed_tab, orient='vertical', command=detailed_tree.yview)
-            detailed_tree.configure(yscrollcommand=detailed_scrollbar.set)
-            detailed_tree.pack(side='left', fill='both', expand=True, padx=5, pady=5)
-            detailed_scrollbar.pack(side='right', fill='y')
-            
-            # Shift Distribution Tab
-            shift_tab = ttk.Frame(results_notebook)
-            results_notebook.add(shift_tab, text='Shift Distribution')
-            
-            # Create shift distribution table
-            shift_tree = ttk.Treeview(shift_tab, show='headings', height=10)
-            shift_cols = ('Process', 'Total Shifts', 'Morning %', 'Evening %', 'Night %')
-            shift_tree['columns'] = shift_cols
-            
-            for col in shift_cols:
-                shift_tree.heading(col, text=col)
-                shift_tree.column(col, width=120, anchor='center')
-            
-            # Add shift distribution data
-            for process in processes:
-                process_result = result[process]
-                if process_result and process_result.get('solver_status') == 'Optimal':
-                    if process in ['dispensing', 'granulation']:
-                        morning = process_result.get('morning_shifts', 0)
-                        evening = process_result.get('evening_shifts', 0)
-                        night = process_result.get('night_shifts', 0)
-                    else:
-                        morning_shifts = process_result.get('morning_shifts', {})
-                        evening_shifts = process_result.get('evening_shifts', {})
-                        night_shifts = process_result.get('night_shifts', {})
-                        
-                        if isinstance(morning_shifts, dict):
-                            morning = sum(morning_shifts.values())
-                            evening = sum(evening_shifts.values())
-                            night = sum(night_shifts.values())
-                        else:
-                            morning = morning_shifts
-                            evening = evening_shifts
-                            night = night_shifts
-                    
-                    total = morning + evening + night
-                    
-                    if total > 0:
-                        morning_pct = f"{(morning/total)*100:.1f}%"
-                        evening_pct = f"{(evening/total)*100:.1f}%"
-                        night_pct = f"{(night/total)*100:.1f}%"
-                        
-                        shift_tree.insert('', 'end', values=(
-                            process.capitalize(),
-                            total,
-                            morning_pct,
-                            evening_pct,
-                            night_pct
-                        ))
+            # Detailed and shift distribution rows
+            detailed_rows, shift_rows = _detail_and_shift_rows(
+                (process.capitalize(), result[process]) for process in processes
+            )
             
-            # Add scrollbar to shift distribution table
-            shift_scrollbar = ttk.Scrollbar(shift_tab, orient='vertical', command=shift_tree.yview)
-            shift_tree.configure(yscrollcommand=shift_scrollbar.set)
-            shift_tree.pack(side='left', fill='both', expand=True, padx=5, pady=5)
-            shift_scrollbar.pack(side='right', fill='y')
+            # Their tables are only built once the user opens the tab
+            self.add_lazy_tabs(results_notebook, [
+                ('Detailed Results', lambda tab: self.fill_detailed_tab(tab, detailed_rows)),
+                ('Shift Distribution', lambda tab: self.fill_shift_tab(tab, shift_rows)),
+            ])
 
-            # Update the GUI
-            self.root.update_idletasks()
+            # Show the finished panel: Tk lays it out and draws it in one go
+            self.results_frame.pack(fill='x', padx=20, pady=10)
+            self.shown_results = (self.results_frame, result)
 
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
@@ -1541,14 +1422,40 @@ class ModernProductionSchedulerGUI:
     def clear_results(self):
         """Helper method to safely clear results frame"""
         try:
-            if hasattr(self, 'results_frame') and self.results_frame is not None:
-                if self.results_frame.winfo_exists():
-                    self.results_frame.destroy()
+            # Tk ignores a window that is already gone, so there is no need
+            # to ask winfo_exists() first
+            if self.results_frame is not None:
+                self.results_frame.destroy()
                 self.results_frame = None
         except Exception:
             # If any error occurs during cleanup, ensure results_frame is None
             self.results_frame = None
 
+    def reset_common_parameters(self):
+        """Reset the parameters shared by all tabs to their defaults and clear the results"""
+        # Reset common parameters to defaults
+        self.buffer_var.set(self.default_values['buffer_percentage'])
+        self.days_var.set(self.default_values['days_limit'])
+        
+        # Reset shift weights to defaults
+        self.morning_weight_var.set(self.default_values['morning_weight'])
+        self.evening_weight_var.set(self.default_values['evening_weight'])
+        self.night_weight_var.set(self.default_values['night_weight'])
+        
+        # Reset machine selections to checked
+        for var in self.machine_vars.values():
+            var.set(True)
+        
+        # Refresh the validation marks for the reset values
+        for validate in self.field_validators:
+            validate()
+        
+        # Clear results
+        self.clear_results()
+        
+        # Update the GUI
+        self.root.update_idletasks()
+
     def clear_individual(self):
         """Clear results and reset input fields for individual processes"""
         try:
@@ -1558,24 +1465,7 @@ class ModernProductionSchedulerGUI:
             self.tab_batches_var.set(10)
             self.coat_batches_var.set(10)
             
-            # Reset common parameters to defaults
-            self.buffer_var.set(self.default_values['buffer_percentage'])
-            self.days_var.set(self.default_values['days_limit'])
-            
-            # Reset shift weights to defaults
-            self.morning_weight_var.set(self.default_values['morning_weight'])
-            self.evening_weight_var.set(self.default_values['evening_weight'])
-            self.night_weight_var.set(self.default_values['night_weight'])
-            
-            # Reset machine selections to checked
-            for machine in self.machine_vars:
-                self.machine_vars[machine].set(True)
-            
-            # Clear results
-            self.clear_results()
-            
-            # Update the GUI
-            self.root.update_idletasks()
+            self.reset_common_parameters()
             
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred while clearing: {str(e)}")
@@ -1586,24 +1476,7 @@ class ModernProductionSchedulerGUI:
             # Reset input fields to default values
             self.total_batches_var.set(self.default_values['total_batches'])
             
-            # Reset common parameters to defaults
-            self.buffer_var.set(self.default_values['buffer_percentage'])
-            self.days_var.set(self.default_values['days_limit'])
-            
-            # Reset shift weights to defaults
-            self.morning_weight_var.set(self.default_values['morning_weight'])
-            self.evening_weight_var.set(self.default_values['evening_weight'])
-            self.night_weight_var.set(self.default_values['night_weight'])
-            
-            # Reset machine selections to checked
-            for machine in self.machine_vars:
-                self.machine_vars[machine].set(True)
-            
-            # Clear results
-            self.clear_results()
-            
-            # Update the GUI
-            self.root.update_idletasks()
+            self.reset_common_parameters()
             
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred while clearing: {str(e)}")
@@ -1611,35 +1484,14 @@ class ModernProductionSchedulerGUI:
     def clear_maximum(self):
         """Clear results and reset input fields for maximum capacity calculation"""
         try:
-            # Reset days limit to default
-            self.days_var.set(self.default_values.get('days_limit', 30))
-            
-            # Reset buffer percentage to default
-            self.buffer_var.set(self.default_values.get('buffer_percentage', 20))
-            
-            # Reset shift weights to defaults
-            self.morning_weight_var.set(self.default_values.get('morning_weight', 0.0))
-            self.evening_weight_var.set(self.default_values.get('evening_weight', 0.1))
-            self.night_weight_var.set(self.default_values.get('night_weight', 2.0))
-            
-            # Reset machine selections to default (all True)
-            for machine in ['p3030', 'p3090i', 'ima', 'bosch', 'glatt']:
-                if hasattr(self, 'machine_vars') and machine in self.machine_vars:
-                    self.machine_vars[machine].set(True)
-            
-            # Clear results
-            self.clear_results()
-            
-            # Update the GUI
-            self.root.update_idletasks()
+            self.reset_common_parameters()
             
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred while clearing: {str(e)}")
 
     def add_scenario_buttons(self):
         """Add Save, Compare, and Clear Scenarios buttons to each tab"""
-        for tab_index in range(3):  # For each of our three tabs
-            tab = self.notebook.winfo_children()[tab_index]
+        for tab_index, tab in enumerate(self.tabs.values()):  # For each of our three tabs
             button_frame = ttk.Frame(tab)
             button_frame.pack(side='bottom', fill='x', padx=20, pady=10)
             
@@ -1664,8 +1516,10 @@ class ModernProductionSchedulerGUI:
     def save_scenario(self, tab_index):
         """Save current parameters and results as a scenario"""
         try:
-            # Get current timestamp for scenario ID
-            scenario_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Get current timestamp for scenario ID (one clock reading for
+            # both the ID and the displayed time)
+            now = datetime.now()
+            scenario_id = now.strftime("%Y%m%d_%H%M%S")
             
             # Get tab type
             tab_types = ['Individual', 'Uniform', 'Maximum']
@@ -1675,13 +1529,34 @@ class ModernProductionSchedulerGUI:
             scenario = {
                 'id': scenario_id,
                 'type': tab_type,
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'timestamp': now.strftime("%Y-%m-%d %H:%M:%S"),
                 'parameters': self.get_current_parameters(tab_type),
                 'results': self.get_current_results()
             }
             
+            # Nothing changed since an earlier save: point at that scenario instead
+            key = json.dumps(
+                [tab_type, scenario['parameters'], scenario['results']], sort_keys=True
+            )
+            saved_id = self.scenario_keys.get(key)
+            if saved_id in self.scenarios:
+                messagebox.showinfo(
+                    "Info",
+                    f"This scenario is already saved.\nScenario ID: {saved_id}"
+                )
+                return
+            
             # Save scenario
             self.scenarios[scenario_id] = scenario
+            self.scenario_keys[key] = scenario_id
+            self.chart_figure = None
+            self.chart_future = None
+            
+            # An open Chart View would keep the old chart (or a placeholder
+            # whose drawing was just dropped): redraw it with this scenario
+            if (self.comparison is not None and 'chart_tab' in self.comparison
+                    and self.comparison['window'].winfo_exists()):
+                self.show_comparison_chart()
             
             messagebox.showinfo(
                 "Success",
@@ -1720,50 +1595,10 @@ class ModernProductionSchedulerGUI:
 
     def get_current_results(self):
         """Get current results if available"""
-        if not hasattr(self, 'results_frame') or self.results_frame is None:
-            return None
-        
-        try:
-            # Find the results notebook and get the summary tab
-            for child in self.results_frame.winfo_children():
-                if isinstance(child, ttk.Frame):  # Results container
-                    for notebook_child in child.winfo_children():
-                        if isinstance(notebook_child, ttk.Notebook):  # Results notebook
-                            summary_tab = notebook_child.winfo_children()[0]  # First tab is summary
-                            
-                            # Find the treeview in the summary tab
-                            for tab_child in summary_tab.winfo_children():
-                                if isinstance(tab_child, ttk.Frame):  # Table frame
-                                    for frame_child in tab_child.winfo_children():
-                                        if isinstance(frame_child, ttk.Treeview):
-                                            tree = frame_child
-                                            
-                                            # Get the total values from all processes
-                                            total_staff = 0
-                                            total_staff_buffer = 0
-                                            total_days = 0
-                                            total_batches = 0
-                                            
-                                            # Sum up values from each process
-                                            for item in tree.get_children():
-                                                values = tree.item(item)['values']
-                                                if values[1] != 'N/A':  # Skip infeasible results
-                                                    total_staff += int(values[1])  # Staff Required
-                                                    total_staff_buffer += int(values[2])  # With Buffer
-                                                    total_days = max(total_days, int(values[3]))  # Days Used
-                                                    total_batches += int(values[4])  # Batches Produced
-                                            
-                                            return {
-                                                'staff_required': total_staff,
-                                                'staff_with_buffer': total_staff_buffer,
-                                                'days_used': total_days,
-                                                'batches_produced': total_batches
-                                            }
-        
-            return None
-        except Exception as e:
-            print(f"Error extracting results: {str(e)}")
+        # Totals of the panel currently shown, summed when it was filled in
+        if self.summary_totals is None or self.summary_totals[0] is not self.results_frame:
             return None
+        return dict(self.summary_totals[1])
 
     def show_comparison(self):
         """Show comparison window for saved scenarios"""
@@ -1774,10 +1609,21 @@ class ModernProductionSchedulerGUI:
             )
             return
         
-        # Create comparison window
+        # Window from an earlier comparison: bring it back with current data
+        if self.comparison is not None and self.comparison['window'].winfo_exists():
+            self.fill_comparison_table()
+            if 'chart_tab' in self.comparison:
+                self.show_comparison_chart()
+            self.comparison['window'].deiconify()
+            self.comparison['window'].lift()
+            return
+        
+        # Create comparison window; closing it only hides it
         comparison_window = tk.Toplevel(self.root)
         comparison_window.title("Scenario Comparison")
         comparison_window.geometry("1000x800")
+        comparison_window.protocol("WM_DELETE_WINDOW", comparison_window.withdraw)
+        self.comparison = {'window': comparison_window, 'chart': None, 'figure': None}
         
         # Create notebook for different comparison views
         notebook = ttk.Notebook(comparison_window)
@@ -1793,28 +1639,12 @@ class ModernProductionSchedulerGUI:
         notebook.add(tab, text='Table View')
         
         # Create Treeview for comparison
-        columns = ('Scenario', 'Type', 'Time', 'Staff Required', 'Staff with Buffer', 
-                  'Days Used', 'Batches Produced')
-        tree = ttk.Treeview(tab, columns=columns, show='headings')
-        
-        # Configure columns
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=120)
+        tree = ttk.Treeview(tab, show='headings')
+        self.configure_columns(tree, COMPARISON_COLUMNS)
         
         # Add data
-        for scenario_id, scenario in self.scenarios.items():
-            results = scenario['results']
-            if results:
-                tree.insert('', 'end', values=(
-                    scenario_id,
-                    scenario['type'],
-                    scenario['timestamp'],
-                    results.get('staff_required', 'N/A'),
-                    results.get('staff_with_buffer', 'N/A'),
-                    results.get('days_used', 'N/A'),
-                    results.get('batches_produced', 'N/A')
-                ))
+        self.comparison['tree'] = tree
+        self.fill_comparison_table()
         
         # Add scrollbar
         scrollbar = ttk.Scrollbar(tab, orient='vertical', command=tree.yview)
@@ -1824,37 +1654,112 @@ class ModernProductionSchedulerGUI:
         tree.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
 
+    def fill_comparison_table(self):
+        """(Re)fill the comparison table with the saved scenarios"""
+        tree = self.comparison['tree']
+        tree.delete(*tree.get_children())
+        self.insert_rows(tree, [
+            (
+                scenario_id,
+                scenario['type'],
+                scenario['timestamp'],
+                results.get('staff_required', 'N/A'),
+                results.get('staff_with_buffer', 'N/A'),
+                results.get('days_used', 'N/A'),
+                results.get('batches_produced', 'N/A')
+            )
+            for scenario_id, scenario in self.scenarios.items()
+            if (results := scenario['results'])
+        ])
+
     def create_chart_comparison_tab(self, notebook):
-        """Create tab for chart comparison view"""
-        tab = ttk.Frame(notebook)
-        notebook.add(tab, text='Chart View')
+        """Create tab for chart comparison view; the chart is only drawn once the tab is opened"""
+        self.add_lazy_tabs(notebook, [('Chart View', self.fill_chart_comparison_tab)])
+
+    def fill_chart_comparison_tab(self, tab):
+        """Show the scenarios chart in the Chart View tab, on its first selection"""
+        self.comparison['chart_tab'] = tab
+        self.show_comparison_chart()
+
+    def show_comparison_chart(self):
+        """Put the scenarios chart in the comparison window, unless it already shows it"""
+        fig = self.chart_figure
+        if fig is None and self.chart_future is None:
+            # Draw the chart on the worker pool; the window opens right away
+            # with a placeholder and gets the chart when it is ready
+            self.chart_future = self.pool.submit(self.draw_comparison_chart, dict(self.scenarios))
+            self.root.after(50, self.collect_comparison_chart, self.chart_future)
+        
+        chart = self.comparison['chart']
+        if chart is not None:
+            if self.comparison['figure'] is fig:
+                return
+            chart.destroy()
+        
+        if fig is None:
+            chart = ttk.Label(self.comparison['chart_tab'], text="Drawing chart...")
+        else:
+            # matplotlib is only needed here, so it is imported on first use
+            # rather than at application startup
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            
+            canvas = FigureCanvasTkAgg(fig, master=self.comparison['chart_tab'])
+            canvas.draw()
+            chart = canvas.get_tk_widget()
+        chart.pack(fill='both', expand=True)
+        self.comparison['chart'] = chart
+        self.comparison['figure'] = fig
+
+    def collect_comparison_chart(self, future):
+        """Poll the chart drawing and show the chart once it is done"""
+        # Scenarios changed meanwhile: this chart is no longer wanted
+        if future is not self.chart_future:
+            return
+        if not future.done():
+            self.root.after(50, self.collect_comparison_chart, future)
+            return
+        
+        self.chart_future = None
+        try:
+            self.chart_figure = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to draw the comparison chart: {str(e)}")
+            return
+        
+        if self.comparison is not None and self.comparison['window'].winfo_exists():
+            self.show_comparison_chart()
+
+    def draw_comparison_chart(self, scenarios):
+        """
+        Plot the scenarios' metrics on a new 2x2 bar chart Figure. Runs on the
+        worker pool, so it only uses matplotlib's object API and gets its own
+        copy of the scenarios.
+        """
+        from matplotlib.figure import Figure
         
-        # Create Figure and Canvas
         fig = Figure(figsize=(10, 6))
-        canvas = FigureCanvasTkAgg(fig, master=tab)
         
         # Create subplots for different metrics
         axes = fig.subplots(2, 2)
         fig.suptitle('Scenario Comparison')
         
-        # Plot data
-        scenario_labels = list(self.scenarios.keys())
-        metrics = {
-            'Staff Required': [s['results'].get('staff_required', 0) for s in self.scenarios.values()],
-            'Staff with Buffer': [s['results'].get('staff_with_buffer', 0) for s in self.scenarios.values()],
-            'Days Used': [s['results'].get('days_used', 0) for s in self.scenarios.values()],
-            'Batches Produced': [s['results'].get('batches_produced', 0) for s in self.scenarios.values()]
-        }
-        
-        for (i, j), (metric, values) in zip([(0,0), (0,1), (1,0), (1,1)], metrics.items()):
-            axes[i,j].bar(range(len(scenario_labels)), values)
-            axes[i,j].set_title(metric)
-            axes[i,j].set_xticks(range(len(scenario_labels)))
-            axes[i,j].set_xticklabels(scenario_labels, rotation=45)
+        # Plot data: the four metrics of every scenario in one pass
+        scenario_labels = list(scenarios.keys())
+        metric_keys = ('staff_required', 'staff_with_buffer', 'days_used', 'batches_produced')
+        columns = zip(*(
+            [results.get(key, 0) for key in metric_keys]
+            for results in (s['results'] or {} for s in scenarios.values())
+        ))
+        metrics = dict(zip(('Staff Required', 'Staff with Buffer', 'Days Used', 'Batches Produced'), columns))
+        
+        for ax, (metric, values) in zip(axes.flat, metrics.items()):
+            ax.bar(range(len(scenario_labels)), values)
+            ax.set_title(metric)
+            ax.set_xticks(range(len(scenario_labels)))
+            ax.set_xticklabels(scenario_labels, rotation=45)
         
         fig.tight_layout()
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        return fig
 
     def clear_all_scenarios(self):
         """Clear all saved scenarios after confirmation"""
@@ -1871,15 +1776,15 @@ class ModernProductionSchedulerGUI:
         if confirm:
             # Clear the scenarios dictionary
             self.scenarios.clear()
-            
-            # Close any open comparison windows
-            for widget in self.root.winfo_children():
-                if isinstance(widget, tk.Toplevel) and widget.winfo_name().startswith('!toplevel'):
-                    widget.destroy()
-            
-            # Force garbage collection to free memory
-            import gc
-            gc.collect()
+            self.scenario_keys.clear()
+            self.chart_figure = None
+            self.chart_future = None
+            
+            # Close the comparison window (shown or hidden); the next one is
+            # built from scratch
+            if self.comparison is not None:
+                self.comparison['window'].destroy()
+                self.comparison = None
             
             messagebox.showinfo("Success", "All scenarios have been cleared.")
 
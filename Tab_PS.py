@@ -1,6 +1,168 @@
 import math
+import sys
+import threading
+from functools import lru_cache
+
+import numpy as np
 import pulp
-from PS_GUI3 import solver
+from solver_setup import solver as SOLVER_INSTANCE
+
+
+def daily_capacity(use_p3030=True, use_p3090i=True, use_ima=True):
+    """
+    Maximum tableting batches per day with the selected machines
+    (P3030 => 1, P3090i => 2, IMA => 1 batch/shift; 3 shifts/day).
+    """
+    return 3 * (1 * use_p3030 + 2 * use_p3090i + 1 * use_ima)
+
+
+def min_shifts_per_day(batches_required, num_workdays, use_p3030=True, use_p3090i=True, use_ima=True):
+    """
+    Fewest shifts per day that can cover batches_required in num_workdays
+    when every day runs its most productive shifts first.
+    """
+    outputs = sorted([1] * 3 * use_p3030 + [2] * 3 * use_p3090i + [1] * 3 * use_ima, reverse=True)
+    produced = 0
+    for shifts, output in enumerate(outputs):
+        if produced * num_workdays >= batches_required:
+            return shifts
+        produced += output
+    return len(outputs)
+
+
+@lru_cache(maxsize=32)
+def _build_model(num_workdays: int, use_p3030: bool, use_p3090i: bool, use_ima: bool,
+                 break_symmetry: bool):
+    """
+    Build the structural part of the tableting model for a given horizon and
+    machine selection.
+
+    The weights and batches_required only touch the objective and the RHS of
+    two rows - DemandConstraint and StaffLowerBound (both set per call in
+    optimize_tableting) - so the variables and constraints are built once per
+    (num_workdays, use_p3030, use_p3090i, use_ima, break_symmetry) and reused
+    across calls.
+
+    :param break_symmetry: whether to add the day-ordering rows (see (d))
+
+    :return: dict with the model, its variables and a lock guarding re-solves
+    """
+    # ------------------------------------------------------------------
+    # 1. CREATE THE LP PROBLEM
+    # ------------------------------------------------------------------
+    model = pulp.LpProblem("TabletingSchedule", pulp.LpMinimize)
+
+    # ------------------------------------------------------------------
+    # 2. DECISION VARIABLES
+    # ------------------------------------------------------------------
+    # We'll define binary variables for each machine and each shift/day, e.g.:
+    #   M_p3030[d], E_p3030[d], N_p3030[d]  => 1 if P3030 is run in that shift/day, else 0
+    #
+    # We only include them if the machine is "used"; otherwise, we fix them to 0.
+
+    # For convenience, define a small function to create or fix to zero
+    # (LpVariable.dicts names them M_p3030_0, M_p3030_1, ...):
+    days = range(num_workdays)
+
+    def make_vars(name, use_machine):
+        if use_machine:
+            return pulp.LpVariable.dicts(name, days, cat=pulp.LpBinary)
+        return dict.fromkeys(days, 0)
+
+    # Create shift variables for each machine/day
+    M_p3030 = make_vars("M_p3030", use_p3030)
+    E_p3030 = make_vars("E_p3030", use_p3030)
+    N_p3030 = make_vars("N_p3030", use_p3030)
+
+    M_p3090i = make_vars("M_p3090i", use_p3090i)
+    E_p3090i = make_vars("E_p3090i", use_p3090i)
+    N_p3090i = make_vars("N_p3090i", use_p3090i)
+
+    M_ima = make_vars("M_ima", use_ima)
+    E_ima = make_vars("E_ima", use_ima)
+    N_ima = make_vars("N_ima", use_ima)
+
+    # Staff variable (integer)
+    staff_var = pulp.LpVariable("Staff", lowBound=0, cat=pulp.LpInteger)
+
+    # dayUsed variable (1 if any shift scheduled on day d, 0 otherwise)
+    dayUsed = pulp.LpVariable.dicts("dayUsed", days, cat=pulp.LpBinary)
+
+    # ------------------------------------------------------------------
+    # 3. CONSTRAINTS
+    # ------------------------------------------------------------------
+
+    # Only the selected machines enter the sums below (with their batches/shift:
+    #   P3030 => 1, P3090i => 2, IMA => 1)
+    active_machines = [
+        (shifts, batches_per_shift)
+        for shifts, batches_per_shift, use_machine in (
+            ((M_p3030, E_p3030, N_p3030), 1, use_p3030),
+            ((M_p3090i, E_p3090i, N_p3090i), 2, use_p3090i),
+            ((M_ima, E_ima, N_ima), 1, use_ima),
+        )
+        if use_machine
+    ]
+
+    # (a) Demand constraint: total batches >= batches_required
+    # (the RHS is set per call in optimize_tableting)
+    total_batches = pulp.lpSum(
+        batches_per_shift * shifts[s][d]
+        for d in range(num_workdays)
+        for s in range(3)
+        for shifts, batches_per_shift in active_machines
+    )
+
+    model += (total_batches >= 0), "DemandConstraint"
+
+    # Sum of all shift usages (for all machines) in day d; the staff, dayUsed
+    # and day-ordering rows below all reuse it
+    day_shift_sums = [
+        pulp.lpSum(shift_vars[d] for shifts, _ in active_machines for shift_vars in shifts)
+        for d in range(num_workdays)
+    ]
+
+    # (b) Staff constraints
+    #  We follow the same logic from Dispensing, assuming staff cannot be reused
+    #  in the same day across multiple shifts or machines. 
+    #  => staff_var >= 3 * (# of shifts used by any machine in day d).
+    for d, sum_shifts_day_d in enumerate(day_shift_sums):
+        # Each shift usage requires 3 people => total staff for that day
+        model += staff_var >= 3 * sum_shifts_day_d, f"StaffDay_{d}"
+
+    # Valid lower bound on the staff from the demand alone (RHS set per call)
+    model += (staff_var >= 0), "StaffLowerBound"
+
+    # (c) Linking dayUsed[d] with shift usage:
+    #     dayUsed[d] = 1 if any shift is used on day d
+    for d, all_shifts_d in enumerate(day_shift_sums):
+        # If any shift is used, dayUsed[d] must be >= 1. Because they're binary,
+        # dayUsed[d] >= (all_shifts_d / something). But simpler:
+        model += dayUsed[d] >= all_shifts_d / 9.0, f"DayUsed_{d}"
+        # (there are at most 9 shift variables per day if all 3 machines are used)
+
+    # (d) Symmetry breaking between interchangeable days
+    #     Weekdays only differ from each other by their index, and so do weekend
+    #     days (day 0 = Monday => days 5, 6, 12, 13, ... are weekend days), so
+    #     any schedule can be reordered within each group without changing the
+    #     objective. Fixing one order - busiest day first, used days first -
+    #     keeps the solver from exploring all those permutations.
+    if break_symmetry:
+        for weekend in (False, True):
+            group = [d for d in range(num_workdays) if (d % 7 >= 5) == weekend]
+            for d, next_d in zip(group, group[1:]):
+                model += day_shift_sums[d] >= day_shift_sums[next_d], f"DayOrder_{d}"
+                model += dayUsed[d] >= dayUsed[next_d], f"DayUsedOrder_{d}"
+
+    return {
+        "model": model,
+        "M_p3030": M_p3030, "E_p3030": E_p3030, "N_p3030": N_p3030,
+        "M_p3090i": M_p3090i, "E_p3090i": E_p3090i, "N_p3090i": N_p3090i,
+        "M_ima": M_ima, "E_ima": E_ima, "N_ima": N_ima,
+        "staff_var": staff_var,
+        "dayUsed": dayUsed,
+        "lock": threading.Lock(),
+    }
 
 
 def optimize_tableting(
@@ -16,7 +178,8 @@ def optimize_tableting(
     w_night: float = 2.0,
     w_weekend: float = 3.0,
     w_daysUsed: float = 1.0,
-    print_solution: bool = True
+    print_solution: bool = True,
+    solver=None
 ):
     """
     Optimization for Tableting (OSD) scheduling with up to three machines:
@@ -43,23 +206,18 @@ def optimize_tableting(
     :param w_weekend: penalty for each shift run on a weekend day
     :param w_daysUsed: penalty for each day that is used
     :param print_solution: whether to print out the results
+    :param solver: PuLP solver to use (defaults to the one configured at startup),
+                   e.g. pulp.HiGHS(msg=False, gapRel=0.005, timeLimit=10) to stop early
     :return: dict with solution details or None if infeasible
     """
+    if solver is None:
+        solver = SOLVER_INSTANCE
 
     # ------------------------------------------------------------------
     # 1. Quick feasibility check based on maximum daily capacity
     # ------------------------------------------------------------------
-    # Each machine can produce a certain number of batches per shift:
-    machine_output = 0
-    if use_p3030:
-        machine_output += 1  # P3030 => 1 batch/shift
-    if use_p3090i:
-        machine_output += 2  # P3090i => 2 batches/shift
-    if use_ima:
-        machine_output += 1  # IMA => 1 batch/shift
-
-    # Maximum daily capacity = machine_output * 3 shifts
-    max_daily_batches = machine_output * 3
+    # Maximum daily capacity = batches/shift of the selected machines * 3 shifts
+    max_daily_batches = daily_capacity(use_p3030, use_p3090i, use_ima)
     if max_daily_batches == 0:
         # No machines are used => can't produce anything
         if print_solution:
@@ -79,143 +237,102 @@ def optimize_tableting(
         return None
 
     # ------------------------------------------------------------------
-    # 2. CREATE THE LP PROBLEM
+    # 2. REUSE THE CACHED MODEL FOR THIS HORIZON / MACHINE SELECTION
     # ------------------------------------------------------------------
-    model = pulp.LpProblem("TabletingSchedule", pulp.LpMinimize)
+    # HiGHS finds the symmetry between interchangeable days by itself, and the
+    # explicit day-ordering rows only slow it down; CBC needs them.
+    break_symmetry = not isinstance(solver, getattr(pulp, "HiGHS", ()))
+    cached = _build_model(num_workdays, use_p3030, use_p3090i, use_ima, break_symmetry)
+    model = cached["model"]
+    M_p3030, E_p3030, N_p3030 = cached["M_p3030"], cached["E_p3030"], cached["N_p3030"]
+    M_p3090i, E_p3090i, N_p3090i = cached["M_p3090i"], cached["E_p3090i"], cached["N_p3090i"]
+    M_ima, E_ima, N_ima = cached["M_ima"], cached["E_ima"], cached["N_ima"]
+    staff_var = cached["staff_var"]
+    dayUsed = cached["dayUsed"]
 
     # ------------------------------------------------------------------
-    # 3. DECISION VARIABLES
-    # ------------------------------------------------------------------
-    # We'll define binary variables for each machine and each shift/day, e.g.:
-    #   M_p3030[d], E_p3030[d], N_p3030[d]  => 1 if P3030 is run in that shift/day, else 0
-    #
-    # We only include them if the machine is "used"; otherwise, we fix them to 0.
-
-    # For convenience, define a small function to create or fix to zero:
-    def make_var(name, use_machine):
-        return pulp.LpVariable(name, cat=pulp.LpBinary) if use_machine else 0
-
-    # Create shift variables for each machine/day
-    M_p3030 = {d: make_var(f"M_p3030_{d}", use_p3030) for d in range(num_workdays)}
-    E_p3030 = {d: make_var(f"E_p3030_{d}", use_p3030) for d in range(num_workdays)}
-    N_p3030 = {d: make_var(f"N_p3030_{d}", use_p3030) for d in range(num_workdays)}
-
-    M_p3090i = {d: make_var(f"M_p3090i_{d}", use_p3090i) for d in range(num_workdays)}
-    E_p3090i = {d: make_var(f"E_p3090i_{d}", use_p3090i) for d in range(num_workdays)}
-    N_p3090i = {d: make_var(f"N_p3090i_{d}", use_p3090i) for d in range(num_workdays)}
-
-    M_ima = {d: make_var(f"M_ima_{d}", use_ima) for d in range(num_workdays)}
-    E_ima = {d: make_var(f"E_ima_{d}", use_ima) for d in range(num_workdays)}
-    N_ima = {d: make_var(f"N_ima_{d}", use_ima) for d in range(num_workdays)}
-
-    # Staff variable (integer)
-    staff_var = pulp.LpVariable("Staff", lowBound=0, cat=pulp.LpInteger)
-
-    # dayUsed variable (1 if any shift scheduled on day d, 0 otherwise)
-    dayUsed = {
-        d: pulp.LpVariable(f"dayUsed_{d}", cat=pulp.LpBinary)
-        for d in range(num_workdays)
-    }
-
-    # ------------------------------------------------------------------
-    # 4. WEEKEND DAYS IDENTIFICATION
+    # 3. WEEKEND DAYS IDENTIFICATION
     # ------------------------------------------------------------------
     # Assuming day 0 = Monday => day 5 = Saturday, day 6 = Sunday, etc.
-    weekend_days = set(d for d in range(num_workdays) if d % 7 in [5, 6])
+    is_weekend = (np.arange(num_workdays) % 7) >= 5
 
     # ------------------------------------------------------------------
-    # 5. OBJECTIVE FUNCTION
+    # 4. OBJECTIVE FUNCTION
     # ------------------------------------------------------------------
     # Weighted sum of:
     #   1) staff_var * w_staff
-    #   2) night shifts * w_night
+    #   2) morning / evening / night shifts * w_morning / w_evening / w_night
     #   3) weekend shifts * w_weekend
     #   4) total days used * w_daysUsed
-
-    total_morning_shifts = pulp.lpSum([
-    M_p3030[d] + M_p3090i[d] + M_ima[d] for d in range(num_workdays)
-    ])
-
-    total_evening_shifts = pulp.lpSum([
-        E_p3030[d] + E_p3090i[d] + E_ima[d] for d in range(num_workdays)
-    ])
-
-    total_night_shifts = pulp.lpSum([
-        N_p3030[d] + N_p3090i[d] + N_ima[d] for d in range(num_workdays)
-    ])
-
-
-    # 5b) Sum of weekend shifts
-    total_weekend_shifts = pulp.lpSum([
-        (M_p3030[d] + E_p3030[d] + N_p3030[d] +
-         M_p3090i[d] + E_p3090i[d] + N_p3090i[d] +
-         M_ima[d] + E_ima[d] + N_ima[d])
-        for d in weekend_days
-    ])
-
-    # 5c) Sum of days used
-    total_days_used = pulp.lpSum(dayUsed[d] for d in range(num_workdays))
-
-    # Define objective
-    model += (
-    w_staff * staff_var
-    + w_morning * total_morning_shifts
-    + w_evening * total_evening_shifts
-    + w_night * total_night_shifts
-    + w_weekend * total_weekend_shifts
-    + w_daysUsed * total_days_used
-    ), "WeightedObjective"
-
-    # ------------------------------------------------------------------
-    # 6. CONSTRAINTS
-    # ------------------------------------------------------------------
-
-    # (a) Demand constraint: total batches >= batches_required
-    # Batches per shift per machine:
-    #   P3030 => 1, P3090i => 2, IMA => 1
-    total_batches = []
-    for d in range(num_workdays):
-        # morning
-        total_batches.append(M_p3030[d] * 1 + M_p3090i[d] * 2 + M_ima[d] * 1)
-        # evening
-        total_batches.append(E_p3030[d] * 1 + E_p3090i[d] * 2 + E_ima[d] * 1)
-        # night
-        total_batches.append(N_p3030[d] * 1 + N_p3090i[d] * 2 + N_ima[d] * 1)
-
-    model += (pulp.lpSum(total_batches) >= batches_required), "DemandConstraint"
-
-    # (b) Staff constraints
-    #  We follow the same logic from Dispensing, assuming staff cannot be reused
-    #  in the same day across multiple shifts or machines. 
-    #  => staff_var >= 3 * (# of shifts used by any machine in day d).
-    for d in range(num_workdays):
-        # Sum of all shift usages (for all machines) in day d
-        sum_shifts_day_d = (
-            M_p3030[d] + E_p3030[d] + N_p3030[d]
-            + M_p3090i[d] + E_p3090i[d] + N_p3090i[d]
-            + M_ima[d] + E_ima[d] + N_ima[d]
-        )
-        # Each shift usage requires 3 people => total staff for that day
-        model += staff_var >= 3 * sum_shifts_day_d, f"StaffDay_{d}"
-
-    # (c) Linking dayUsed[d] with shift usage:
-    #     dayUsed[d] = 1 if any shift is used on day d
-    for d in range(num_workdays):
-        all_shifts_d = (
-            M_p3030[d] + E_p3030[d] + N_p3030[d]
-            + M_p3090i[d] + E_p3090i[d] + N_p3090i[d]
-            + M_ima[d] + E_ima[d] + N_ima[d]
+    #
+    # Every shift variable appears exactly once, so its coefficient is w_shift
+    # plus the weekend cost of its day: one (shift x day) matrix covers all of
+    # them, and the whole objective is built in a single pass.
+    shift_weights = np.array([w_morning, w_evening, w_night], dtype=np.float64)
+    shift_costs = (shift_weights[:, None] + w_weekend * is_weekend).tolist()
+    objective_terms = [(staff_var, w_staff)]
+    objective_terms += [(dayUsed[d], w_daysUsed) for d in range(num_workdays)]
+    for costs, machine_shifts in zip(
+        shift_costs,
+        ((M_p3030, M_p3090i, M_ima), (E_p3030, E_p3090i, E_ima), (N_p3030, N_p3090i, N_ima)),
+    ):
+        for shift_vars, use_machine in zip(machine_shifts, (use_p3030, use_p3090i, use_ima)):
+            # (the shifts of unselected machines are the constant 0)
+            if use_machine:
+                objective_terms += zip((shift_vars[d] for d in range(num_workdays)), costs)
+
+    # The cached model is shared between calls, so updating the objective/RHS,
+    # solving and reading the values back must not interleave.
+    with cached["lock"]:
+        model.setObjective(pulp.LpAffineExpression(objective_terms))
+        model.objective.name = "WeightedObjective"
+
+        # Only the demand and staff-bound RHS depend on batches_required
+        model.constraints["DemandConstraint"].changeRHS(batches_required)
+        model.constraints["StaffLowerBound"].changeRHS(
+            3 * min_shifts_per_day(batches_required, num_workdays, use_p3030, use_p3090i, use_ima)
         )
-        # If any shift is used, dayUsed[d] must be >= 1. Because they're binary,
-        # dayUsed[d] >= (all_shifts_d / something). But simpler:
-        model += dayUsed[d] >= all_shifts_d / 9.0, f"DayUsed_{d}"
-        # (there are at most 9 shift variables per day if all 3 machines are used)
 
-    # ------------------------------------------------------------------
-    # 7. SOLVE THE MODEL
-    # ------------------------------------------------------------------
-    result_status = model.solve(solver)
-    solver_status = pulp.LpStatus[model.status]
+        # ------------------------------------------------------------------
+        # 5. SOLVE THE MODEL
+        # ------------------------------------------------------------------
+        model.solve(solver)
+        solver_status = pulp.LpStatus[model.status]
+
+        # ------------------------------------------------------------------
+        # 6. EXTRACT RESULTS
+        # ------------------------------------------------------------------
+        # Read the values before releasing the cached model.
+        if solver_status == 'Optimal':
+            # Gather each shift dict into an array once and do the sums with numpy
+            # (the shifts of unselected machines are the constant 0).
+            def gather(vdict, use_machine=True):
+                if not use_machine:
+                    return np.zeros(num_workdays)
+                return np.fromiter(
+                    (vdict[d].varValue for d in range(num_workdays)),
+                    dtype=float, count=num_workdays
+                )
+
+            shift_values = np.rint(np.vstack([
+                gather(M_p3030, use_p3030), gather(E_p3030, use_p3030), gather(N_p3030, use_p3030),
+                gather(M_p3090i, use_p3090i), gather(E_p3090i, use_p3090i), gather(N_p3090i, use_p3090i),
+                gather(M_ima, use_ima), gather(E_ima, use_ima), gather(N_ima, use_ima),
+            ]))
+
+            # Summaries
+            (morning_p3030,  evening_p3030,  night_p3030,
+             morning_p3090i, evening_p3090i, night_p3090i,
+             morning_ima,    evening_ima,    night_ima) = (int(t) for t in shift_values.sum(axis=1))
+
+            min_staff = round(staff_var.varValue)
+            # Batches per shift: P3030 => 1, P3090i => 2, IMA => 1
+            total_produced = (
+                morning_p3030 + evening_p3030 + night_p3030
+                + 2 * (morning_p3090i + evening_p3090i + night_p3090i)
+                + morning_ima + evening_ima + night_ima
+            )
+            used_days_count = int(np.rint(gather(dayUsed)).sum())
 
     if solver_status != 'Optimal':
         # Could be infeasible or unbounded for other reasons
@@ -228,58 +345,42 @@ def optimize_tableting(
                 print(f"  => {more_days_needed} more day(s).")
         return None
 
-    # ------------------------------------------------------------------
-    # 8. EXTRACT RESULTS
-    # ------------------------------------------------------------------
-    # Summaries
-    morning_p3030  = sum(int(M_p3030[d].varValue) for d in range(num_workdays)) if use_p3030 else 0
-    evening_p3030  = sum(int(E_p3030[d].varValue) for d in range(num_workdays)) if use_p3030 else 0
-    night_p3030    = sum(int(N_p3030[d].varValue) for d in range(num_workdays)) if use_p3030 else 0
-
-    morning_p3090i = sum(int(M_p3090i[d].varValue) for d in range(num_workdays)) if use_p3090i else 0
-    evening_p3090i = sum(int(E_p3090i[d].varValue) for d in range(num_workdays)) if use_p3090i else 0
-    night_p3090i   = sum(int(N_p3090i[d].varValue) for d in range(num_workdays)) if use_p3090i else 0
+    # Integer ceil with the buffer in thousandths (no float rounding surprises)
+    buffer_permille = round((1 + buffer_ratio) * 1000)
+    staff_with_buffer = -(-min_staff * buffer_permille // 1000)
 
-    morning_ima    = sum(int(M_ima[d].varValue) for d in range(num_workdays)) if use_ima else 0
-    evening_ima    = sum(int(E_ima[d].varValue) for d in range(num_workdays)) if use_ima else 0
-    night_ima      = sum(int(N_ima[d].varValue) for d in range(num_workdays)) if use_ima else 0
-
-    min_staff = int(staff_var.varValue)
-    staff_with_buffer = math.ceil(min_staff * (1 + buffer_ratio))
-
-    total_produced = pulp.value(pulp.lpSum(total_batches))
     pct_completed = (total_produced / batches_required) * 100 if batches_required > 0 else 0
 
-    used_days_count = sum(int(dayUsed[d].varValue) for d in range(num_workdays))
-
     # ------------------------------------------------------------------
-    # 9. PRINT OR RETURN THE RESULTS
+    # 7. PRINT OR RETURN THE RESULTS
     # ------------------------------------------------------------------
     if print_solution:
-        print("Optimal Schedule for Tableting:")
-        print("================================")
-        print(f"Selected Machines: " 
+        lines = []
+        lines.append("Optimal Schedule for Tableting:")
+        lines.append("================================")
+        lines.append(f"Selected Machines: " 
               f"P3030={use_p3030}, P3090i={use_p3090i}, IMA={use_ima}")
-        print(f"Number of Workdays in Horizon: {num_workdays}")
-        print(f"Demanded Batches: {batches_required}")
-        print()
-        print("Shifts Summary (total count of shifts across days):")
+        lines.append(f"Number of Workdays in Horizon: {num_workdays}")
+        lines.append(f"Demanded Batches: {batches_required}")
+        lines.append("")
+        lines.append("Shifts Summary (total count of shifts across days):")
         if use_p3030:
-            print(f"  P3030:   Morning={morning_p3030}, Evening={evening_p3030}, Night={night_p3030}")
+            lines.append(f"  P3030:   Morning={morning_p3030}, Evening={evening_p3030}, Night={night_p3030}")
         if use_p3090i:
-            print(f"  P3090i:  Morning={morning_p3090i}, Evening={evening_p3090i}, Night={night_p3090i}")
+            lines.append(f"  P3090i:  Morning={morning_p3090i}, Evening={evening_p3090i}, Night={night_p3090i}")
         if use_ima:
-            print(f"  IMA:     Morning={morning_ima}, Evening={evening_ima}, Night={night_ima}")
-        print()
-        print(f"Total Batches Produced: {int(total_produced)}")
-        print(f"% of Demand Completed:  {pct_completed:.1f}%")
-        print()
-        print(f"Minimal Headcount (no buffer): {min_staff}")
-        print(f"Headcount with {int(buffer_ratio*100)}% buffer: {staff_with_buffer}")
-        print()
-        print(f"Number of days used: {used_days_count}")
-        print(f"Solver status: {solver_status}")
-        print("=" * 50)
+            lines.append(f"  IMA:     Morning={morning_ima}, Evening={evening_ima}, Night={night_ima}")
+        lines.append("")
+        lines.append(f"Total Batches Produced: {total_produced}")
+        lines.append(f"% of Demand Completed:  {pct_completed:.1f}%")
+        lines.append("")
+        lines.append(f"Minimal Headcount (no buffer): {min_staff}")
+        lines.append(f"Headcount with {int(buffer_ratio*100)}% buffer: {staff_with_buffer}")
+        lines.append("")
+        lines.append(f"Number of days used: {used_days_count}")
+        lines.append(f"Solver status: {solver_status}")
+        lines.append("=" * 50)
+        sys.stdout.write("\n".join(lines) + "\n")
 
     return {
         "machines_used": {
@@ -302,7 +403,7 @@ def optimize_tableting(
             "P3090i": night_p3090i,
             "IMA": night_ima
         },
-        "total_batches_produced": int(total_produced),
+        "total_batches_produced": total_produced,
         "pct_demand_completed": pct_completed,
         "min_staff_required": min_staff,
         "staff_with_buffer": staff_with_buffer,
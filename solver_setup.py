@@ -0,0 +1,141 @@
+"""Solver selection shared by the GUI and the optimization modules.
+
+Kept separate from PS_GUI3 so the *_PS modules can import the solver
+without importing the GUI (which in turn imports them).
+"""
+import os
+import sys
+
+import pulp
+
+
+def get_cbc_path():
+    """Get the path to the CBC solver executable."""
+    if getattr(sys, 'frozen', False):  # If running as a PyInstaller bundle
+        base_path = sys._MEIPASS
+    else:
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, 'solver', 'cbc.exe')
+
+def test_solver(solver):
+    """Solve a trivial problem with the given solver.
+    
+    Returns:
+        True if the solver reported an optimal solution.
+    """
+    test_prob = pulp.LpProblem("test", pulp.LpMinimize)
+    x = pulp.LpVariable("x", 0, 1)
+    test_prob += x
+    status = test_prob.solve(solver)
+    return status == pulp.LpStatusOptimal
+
+def setup_highs_solver():
+    """Set up PuLP's in-process HiGHS interface (needs the optional highspy package).
+    
+    HiGHS is called through its Python API, so no solver process is spawned and
+    no MPS/solution files are written for every (tiny) model we solve.
+    
+    Returns:
+        The configured solver instance, or None if HiGHS is not usable.
+    """
+    try:
+        highs_cls = getattr(pulp, 'HiGHS', None)  # PuLP >= 2.8
+        if highs_cls is None:
+            return None
+        # parallel=off: our models are tiny, and HiGHS worker threads would
+        # only compete with the concurrently solved sub-processes. The
+        # 'solver' option is left at its default because setting it to
+        # 'simplex' makes HiGHS solve just the LP relaxation of a MIP.
+        solver = highs_cls(msg=False, parallel='off')
+        if not solver.available():
+            return None
+        if test_solver(solver):
+            print("HiGHS solver test successful")
+            return solver
+        print("HiGHS solver test failed, falling back to CBC")
+    except Exception as e:
+        print(f"Error setting up HiGHS solver: {str(e)}")
+    return None
+
+def setup_pulp_solver():
+    """Set up and configure the PuLP solver.
+    
+    The in-process HiGHS solver is preferred when available; otherwise the
+    bundled CBC executable is used, then any other solver PuLP can find.
+    
+    Returns:
+        The configured solver instance.
+        
+    Raises:
+        FileNotFoundError: If CBC solver is not found.
+        Exception: If no working solver is available.
+    """
+    solver = setup_highs_solver()
+    if solver is not None:
+        return solver
+
+    try:
+        # Get the path to CBC solver
+        cbc_path = get_cbc_path()
+        print(f"Looking for CBC solver at: {cbc_path}")
+        
+        if not os.path.exists(cbc_path):
+            raise FileNotFoundError(f"CBC solver not found at: {cbc_path}")
+            
+        # Verify solver is executable
+        if not os.access(cbc_path, os.X_OK):
+            print("Warning: CBC solver exists but may not be executable")
+            
+        # Configure PuLP to use the found CBC solver
+        # msg=False suppresses solver output. Neither -threads 1 nor warmStart
+        # (which re-reads the cached models' previous solution) is passed: both
+        # made the harder coating instances slower, since CBC spends that time
+        # proving optimality rather than finding an incumbent.
+        solver = pulp.COIN_CMD(path=cbc_path, msg=False, keepFiles=False)
+        # CBC exchanges the model and solution through temporary files on every
+        # solve, so keep them in RAM when a tmpfs is available
+        if os.path.isdir('/dev/shm'):
+            solver.tmpDir = '/dev/shm'
+        
+        # Test the solver with a simple problem
+        if test_solver(solver):
+            print("CBC solver test successful")
+            return solver
+        else:
+            print("CBC solver test failed")
+            raise Exception("CBC solver test failed")
+            
+    except Exception as e:
+        print(f"Error setting up CBC solver: {str(e)}")
+        print("Attempting to use system solver as fallback...")
+        
+        try:
+            # Try to use any available solver
+            available_solvers = []
+            unavailable_solvers = set()
+            
+            for solver_name in pulp.listSolvers(onlyAvailable=False):
+                try:
+                    if pulp.getSolver(solver_name).available():
+                        available_solvers.append(solver_name)
+                    else:
+                        unavailable_solvers.add(solver_name)
+                except:
+                    unavailable_solvers.add(solver_name)
+            
+            print(f"Available solvers: {available_solvers}")
+            print(f"Unavailable solvers: {unavailable_solvers}")
+            
+            if available_solvers:
+                # Try to use the first available solver
+                solver = pulp.getSolver(available_solvers[0])
+                print(f"Using alternative solver: {available_solvers[0]}")
+                return solver
+            else:
+                raise Exception("No working solvers found")
+        except Exception as e2:
+            print(f"Failed to use system solver: {str(e2)}")
+            raise Exception("No working solver found") from e
+
+# Call this function at startup and store the solver instance
+solver = setup_pulp_solver()